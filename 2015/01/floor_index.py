@@ -0,0 +1,165 @@
+"""Block-summarized prefix-sum index for floor queries on Day 1 inputs."""
+
+from __future__ import annotations
+
+import mmap
+from typing import Final
+
+import numpy as np
+
+from floor_scan import step_array
+
+BLOCK_SIZE: Final[int] = 4_096
+BLOCKS_PER_CHUNK: Final[int] = 1_024
+
+
+class FloorIndex:
+    """Answer floor queries about an instruction stream without rescanning it.
+
+    Write ``F(n)`` for the floor after the first ``n`` instructions, so ``F(0) = 0``.
+    The index stores ``F`` only at block boundaries, together with the minimum and
+    maximum of ``F`` over each block and a sparse table over those summaries.
+    Values inside a block are recomputed from the instructions on demand, so the
+    memory use is proportional to the number of blocks rather than the input size.
+    """
+
+    def __init__(
+        self: FloorIndex,
+        buf: bytes | mmap.mmap,
+        block_size: int = BLOCK_SIZE,
+    ) -> None:
+        """Build the index over a buffer of instruction bytes."""
+        self.buf = buf
+        self.block_size = block_size
+        self.length = len(buf)
+        num_blocks = self.length // block_size + 1
+        self.block_base = np.empty(num_blocks, dtype=np.int64)
+        self.block_min = np.empty(num_blocks, dtype=np.int64)
+        self.block_max = np.empty(num_blocks, dtype=np.int64)
+        self._build()
+        self.min_table = self._sparse_table(self.block_min, np.minimum)
+        self.max_table = self._sparse_table(self.block_max, np.maximum)
+        self.running_min = np.minimum.accumulate(self.block_min)
+        self.running_max = np.maximum.accumulate(self.block_max)
+
+    @classmethod
+    def from_text(cls: type[FloorIndex], text: str, **kwargs) -> FloorIndex:
+        """Build an index from instructions held in a string."""
+        return cls(text.encode(), **kwargs)
+
+    @classmethod
+    def from_file(cls: type[FloorIndex], filename: str, **kwargs) -> FloorIndex:
+        """Build an index over a memory-mapped file."""
+        with open(filename, "rb") as infile:
+            if infile.seek(0, 2) == 0:
+                return cls(b"", **kwargs)
+            buf = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buf, **kwargs)
+
+    def _build(self: FloorIndex) -> None:
+        """Fill in the per-block summaries, several blocks at a time."""
+        chunk_size = self.block_size * BLOCKS_PER_CHUNK
+        floor = 0
+        for start in range(0, self.length + 1, chunk_size):
+            steps = step_array(self.buf[start : start + chunk_size])
+            floors = np.empty(steps.size + 1, dtype=np.int64)
+            floors[0] = floor
+            np.cumsum(steps, dtype=np.int64, out=floors[1:])
+            floors[1:] += floor
+            floor = int(floors[-1])
+            if start + chunk_size <= self.length:
+                floors = floors[:-1]  # F(start + chunk_size) begins the next chunk
+            else:  # Pad the last block with a value it already contains
+                pad = -floors.size % self.block_size
+                floors = np.pad(floors, (0, pad), mode="edge")
+            blocks = floors.reshape(-1, self.block_size)
+            first = start // self.block_size
+            self.block_base[first : first + len(blocks)] = blocks[:, 0]
+            self.block_min[first : first + len(blocks)] = blocks.min(axis=1)
+            self.block_max[first : first + len(blocks)] = blocks.max(axis=1)
+
+    @staticmethod
+    def _sparse_table(values: np.ndarray, combine: np.ufunc) -> list[np.ndarray]:
+        """Build a sparse table: level ``j`` summarizes ``2 ** j`` blocks."""
+        table = [values]
+        width = 1
+        while 2 * width <= values.size:
+            prev = table[-1]
+            table.append(combine(prev[:-width], prev[width:]))
+            width *= 2
+        return table
+
+    def _block_floors(self: FloorIndex, block: int) -> np.ndarray:
+        """Recompute ``F`` over the positions covered by a block."""
+        start = block * self.block_size
+        stop = min(start + self.block_size, self.length + 1)
+        floors = np.empty(stop - start, dtype=np.int64)
+        floors[0] = self.block_base[block]
+        np.cumsum(
+            step_array(self.buf[start : stop - 1]), dtype=np.int64, out=floors[1:]
+        )
+        floors[1:] += floors[0]
+        return floors
+
+    def _check_step(self: FloorIndex, step: int) -> None:
+        if not 0 <= step <= self.length:
+            raise ValueError(f"Step {step} outside of range 0 to {self.length}")
+
+    def floor_after(self: FloorIndex, step: int) -> int:
+        """Return the floor after the first ``step`` instructions."""
+        self._check_step(step)
+        block, offset = divmod(step, self.block_size)
+        return int(self._block_floors(block)[offset])
+
+    def first_reaching(self: FloorIndex, floor: int) -> int:
+        """Return the first step after which Santa is on ``floor``, or -1 if never."""
+        if floor == 0:
+            return 0
+        # Floors change by at most one per step, so the first step at or beyond
+        # the target floor is the first step on the target floor.
+        if floor > 0:
+            block = int(np.searchsorted(self.running_max, floor))
+        else:
+            block = int(np.searchsorted(-self.running_min, -floor))
+        if block == self.running_max.size:
+            return -1
+        floors = self._block_floors(block)
+        hits = floors >= floor if floor > 0 else floors <= floor
+        return block * self.block_size + int(np.argmax(hits))
+
+    def _range_extreme(
+        self: FloorIndex,
+        start: int,
+        stop: int,
+        table: list[np.ndarray],
+        combine: np.ufunc,
+    ) -> int:
+        if not 0 <= start < stop <= self.length + 1:
+            raise ValueError(f"Bad range [{start}, {stop}) for {self.length} steps")
+        first_block, first_offset = divmod(start, self.block_size)
+        last_block, last_offset = divmod(stop - 1, self.block_size)
+        if first_block == last_block:
+            floors = self._block_floors(first_block)
+            return int(combine.reduce(floors[first_offset : last_offset + 1]))
+        result = combine(
+            combine.reduce(self._block_floors(first_block)[first_offset:]),
+            combine.reduce(self._block_floors(last_block)[: last_offset + 1]),
+        )
+        if (num_blocks := last_block - first_block - 1) > 0:
+            level = num_blocks.bit_length() - 1
+            result = combine(
+                result,
+                combine(
+                    table[level][first_block + 1],
+                    table[level][last_block - (1 << level)],
+                ),
+            )
+        return int(result)
+
+    def min_floor(self: FloorIndex, start: int, stop: int) -> int:
+        """Return the lowest of ``F(start), ..., F(stop - 1)``."""
+        return self._range_extreme(start, stop, self.min_table, np.minimum)
+
+    def max_floor(self: FloorIndex, start: int, stop: int) -> int:
+        """Return the highest of ``F(start), ..., F(stop - 1)``."""
+        return self._range_extreme(start, stop, self.max_table, np.maximum)
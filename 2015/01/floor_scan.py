@@ -0,0 +1,98 @@
+"""Chunked, parallel scanning of very large Day 1 instruction files."""
+
+from __future__ import annotations
+
+import mmap
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+
+CHUNK_SIZE: Final[int] = 1 << 22  # 4 MiB of instructions per chunk
+
+
+def step_array(buf: bytes | memoryview | mmap.mmap) -> np.ndarray:
+    """Convert raw instruction bytes into an array of floor changes."""
+    raw = np.frombuffer(buf, dtype=np.uint8)
+    return (raw == ord("(")).astype(np.int8) - (raw == ord(")")).astype(np.int8)
+
+
+@dataclass(frozen=True)
+class ChunkSummary:
+    """Summarize the effect of one chunk of instructions.
+
+    ``min_prefix`` is the lowest floor reached within the chunk, relative to the
+    floor at which the chunk was entered.
+    """
+
+    start: int
+    length: int
+    delta: int
+    min_prefix: int
+
+
+def summarize_chunk(filename: str, start: int, length: int) -> ChunkSummary:
+    """Compute the net change and minimum prefix of a chunk of a file."""
+    with open(filename, "rb") as infile, mmap.mmap(
+        infile.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        floors = np.cumsum(step_array(mm[start : start + length]), dtype=np.int64)
+    return ChunkSummary(start, length, int(floors[-1]), int(floors.min()))
+
+
+def first_basement_in_chunk(
+    filename: str, chunk: ChunkSummary, floor_before: int
+) -> int:
+    """Return the 1-based position at which the basement is first entered in a chunk.
+
+    Returns -1 if the basement is never entered within the chunk.
+    """
+    with open(filename, "rb") as infile, mmap.mmap(
+        infile.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        steps = step_array(mm[chunk.start : chunk.start + chunk.length])
+    floors = floor_before + np.cumsum(steps, dtype=np.int64)
+    hits = np.flatnonzero(floors < 0)
+    return chunk.start + int(hits[0]) + 1 if hits.size else -1
+
+
+def chunk_bounds(size: int, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, int]]:
+    """Yield ``(start, length)`` pairs covering a file of ``size`` bytes."""
+    for start in range(0, size, chunk_size):
+        yield start, min(chunk_size, size - start)
+
+
+def combine_summaries(filename: str, summaries: list[ChunkSummary]) -> tuple[int, int]:
+    """Combine chunk summaries (in file order) into the answers for both parts.
+
+    Only the chunk in which the basement is first entered is read a second time.
+    """
+    floor = 0
+    first = -1
+    for chunk in summaries:
+        if first == -1 and floor + chunk.min_prefix < 0:
+            first = first_basement_in_chunk(filename, chunk, floor)
+        floor += chunk.delta
+    return floor, first
+
+
+def scan_file(
+    filename: str, chunk_size: int = CHUNK_SIZE, max_workers: int | None = None
+) -> tuple[int, int]:
+    """Return the final floor and the first basement position for a file.
+
+    The file is memory-mapped and summarized in chunks by a process pool, so the
+    instructions are never held in memory as a ``str``.
+    """
+    with open(filename, "rb") as infile:
+        size = infile.seek(0, 2)
+    if size == 0:
+        return 0, -1
+    starts, lengths = zip(*chunk_bounds(size, chunk_size))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries = list(
+            executor.map(summarize_chunk, [filename] * len(starts), starts, lengths)
+        )
+    return combine_summaries(filename, summaries)
@@ -5,6 +5,9 @@ from sys import argv
 
 from rich.console import Console
 
+from floor_index import FloorIndex
+from floor_scan import scan_file
+
 
 def process_text(text: str) -> int:
     """Count the characters ``(`` and ``)`` and give the result."""
@@ -25,15 +28,29 @@ def when_first_floor(text: str) -> int:
     return -1
 
 
-def process_and_show(text: str, c: Console) -> None:
-    """Process the text and show the solution to both parts."""
-    c.print(f"Part 1: [yellow on black]{process_text(text)}[/]")
-    if (moves := when_first_floor(text)) != -1:
+def show_results(floor: int, moves: int, c: Console) -> None:
+    """Show the solution to both parts."""
+    c.print(f"Part 1: [yellow on black]{floor}[/]")
+    if moves != -1:
         c.print(f"Part 2: [yellow on black]{moves}[/]")
     else:
         c.print("Part 2: [yellow on black]Never in basement[/]")
 
 
+def process_and_show(text: str, c: Console) -> None:
+    """Process the text and show the solution to both parts."""
+    show_results(process_text(text), when_first_floor(text), c)
+
+
+def show_floor_queries(index: FloorIndex, floors: list[int], c: Console) -> None:
+    """Show when each of the requested floors is first reached."""
+    for floor in floors:
+        if (moves := index.first_reaching(floor)) != -1:
+            c.print(f"Floor {floor}: [yellow on black]{moves}[/]")
+        else:
+            c.print(f"Floor {floor}: [yellow on black]Never reached[/]")
+
+
 def interactive_loop(c: Console) -> None:
     """Process user input interactively."""
     while text := c.input("[magenta on black]Input [/](blank to exit): "):
@@ -45,6 +62,8 @@ if __name__ == "__main__":
     if len(argv) == 1:
         interactive_loop(c)
     else:
-        with open(argv[1], "rt") as infile:
-            text = infile.read()
-        process_and_show(text, c)
+        show_results(*scan_file(argv[1]), c)
+        if len(argv) > 2:
+            show_floor_queries(
+                FloorIndex.from_file(argv[1]), [int(k) for k in argv[2:]], c
+            )
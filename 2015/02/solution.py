@@ -1,9 +1,14 @@
 """Solution to Day 2 of 2015 Advent of Code."""
 
+from collections.abc import Callable
 from sys import argv
+from typing import Final
 
 from rich.console import Console
 
+from _resources import watch_main
+from bulk_boxes import file_totals
+
 
 def parse_input(text: str) -> tuple[int, int, int]:
     """Parse a line of the input."""
@@ -32,6 +37,16 @@ def give_part2_result(ribbon: int, c: Console, total: bool = False) -> None:
     c.print(f"{'Total r' if total else 'R'}ibbon needed: [yellow on black]{ribbon} ft")
 
 
+LINE_FCNS: Final[dict[str, Callable[[str], int]]] = {  # Blank lines count as 0
+    "Total paper needed (ft^2)": (
+        lambda x: paper_needed(*parse_input(x)) if x.strip() else 0
+    ),
+    "Total ribbon needed (ft)": (
+        lambda x: ribbon_needed(*parse_input(x)) if x.strip() else 0
+    ),
+}
+
+
 def interactive_loop(c: Console) -> None:
     """Implement the interactive loop."""
     while text := c.input("[magenta on black]Input[/] (blank to exit): "):
@@ -50,15 +65,9 @@ if __name__ == "__main__":
     c = Console()
     if len(argv) == 1:
         interactive_loop(c)
+    elif len(argv) > 2 and argv[1] == "--watch":
+        watch_main(argv, LINE_FCNS)
     else:
-        with open(argv[1], "rt") as infile:
-            text = infile.read()
-        dimensions = [
-            parse_input(pros_line)
-            for line in text.splitlines()
-            if (pros_line := line.strip())
-        ]
-        total_paper = sum(paper_needed(*k) for k in dimensions)
+        total_paper, total_ribbon = file_totals(argv[1])
         give_part1_result(total_paper, c, True)
-        total_ribbon = sum(ribbon_needed(*k) for k in dimensions)
         give_part2_result(total_ribbon, c, True)
@@ -3,78 +3,56 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
 from sys import argv
 from typing import Final
 
 from rich.console import Console
 
 from _resources import interactive_loop, main, report_results
+from vector_paths import PACKED_DIRECTIONS, house_counts
 
 
-@dataclass(frozen=True)
-class Position:
-    """Represents a position, absolute or relative."""
+def count_houses(text: str, num_santas: int = 1) -> int:
+    """Count the distinct houses visited without storing the path.
 
-    x: int
-    y: int
+    Each santa's position is kept as a packed integer, and every move is added
+    straight into the set of visited houses.
+    """
+    santas = [0] * num_santas
+    visited = {0}
+    santa = 0
+    for char in text:
+        if (step := PACKED_DIRECTIONS.get(char)) is not None:
+            santas[santa] += step
+            visited.add(santas[santa])
+            santa = (santa + 1) % num_santas
+    return len(visited)
 
-    def __add__(self: Position, other):
-        """Return ``self + other``."""
-        if isinstance(other, Position):
-            return self.__class__(self.x + other.x, self.y + other.y)
-        else:
-            return NotImplemented
-
-
-DIRECTIONS: Final[dict[str, Position]] = {
-    ">": Position(1, 0),
-    "<": Position(-1, 0),
-    "^": Position(0, 1),
-    "v": Position(0, -1),
-}
-
-
-def parse_input(text: str) -> list[Position]:
-    """Parse input and list as a series of Position objects."""
-    return [DIRECTIONS[char] for char in text if char in DIRECTIONS]
 
+def part1(text: str) -> str:
+    """Provide answer for part 1."""
+    return f"{count_houses(text)} houses"
 
-def places_visited(
-    moves: list[Position], start: Position | None = None, num_santas: int = 1
-) -> list[Position]:
-    """Process a sequence of moves and return the list of locations visited."""
-    outlist: dict[int, list[Position]] = {k: [] for k in range(num_santas)}
-    if start is None:
-        for val in outlist.values():
-            val.append(Position(0, 0))
-    else:
-        for val in outlist.values():
-            val.append(start)
-    for idx, m in enumerate(moves):
-        outlist[idx % num_santas].append(outlist[idx % num_santas][-1] + m)
-    ret_val = []
-    for val in outlist.values():
-        ret_val.extend(val)
-    return ret_val
 
+def part2(text: str) -> str:
+    """Provide answer for part 2."""
+    return f"{count_houses(text, num_santas=2)} houses"
 
-def num_places_visited(places: list[Position]) -> str:
-    """Return the number of houses visited."""
-    return f"{len(set(places))} houses"
 
+def many_santas(num_santas: int) -> Callable[[str], str]:
+    """Create a function reporting the houses visited by ``num_santas`` santas."""
 
-def part1(moves: list[Position]) -> str:
-    """Provide answer for part 1."""
-    return num_places_visited(places_visited(moves))
+    def ret_fcn(text: str) -> str:
+        counts = house_counts(text.encode(), num_santas)
+        return (
+            f"{counts.total} houses ({counts.shared} shared, "
+            f"{counts.per_santa.min()} to {counts.per_santa.max()} per santa)"
+        )
 
-
-def part2(moves: list[Position]) -> str:
-    """Provide answer for part 2."""
-    return num_places_visited(places_visited(moves, num_santas=2))
+    return ret_fcn
 
 
-RESULT_FCN: Final[dict[str, Callable[[list[Position]], str]]] = {
+RESULT_FCN: Final[dict[str, Callable[[str], str]]] = {
     "Part 1": part1,
     "Part 2": part2,
 }
@@ -82,8 +60,10 @@ RESULT_FCN: Final[dict[str, Callable[[list[Position]], str]]] = {
 
 def file_fcn(text: str, c: Console) -> None:
     """Parse and report based on the contents of a string."""
-    report_results(c, parse_input, RESULT_FCN, text)
+    report_results(c, lambda x: x, RESULT_FCN, text)
 
 
 if __name__ == "__main__":
-    main(argv, interactive_loop(parse_input, RESULT_FCN), file_fcn)
+    # Any arguments after the filename are numbers of santas to report on
+    RESULT_FCN.update({f"{k} santas": many_santas(int(k)) for k in argv[2:]})
+    main(argv, interactive_loop(lambda x: x, RESULT_FCN), file_fcn)
@@ -0,0 +1,57 @@
+"""Vectorized path computation for any number of santas on Day 3."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+
+# Positions packed into one integer as ``x + y * 2 ** 32``; moves become additions
+PACKED_DIRECTIONS: Final[dict[str, int]] = {
+    ">": 1,
+    "<": -1,
+    "^": 1 << 32,
+    "v": -(1 << 32),
+}
+
+# Packed move for each byte value (zero for bytes that are not moves)
+DELTAS: Final[np.ndarray] = np.zeros(256, dtype=np.int64)
+for char, step in PACKED_DIRECTIONS.items():
+    DELTAS[ord(char)] = step
+IS_MOVE: Final[np.ndarray] = DELTAS != 0
+
+
+@dataclass(frozen=True)
+class HouseCounts:
+    """Summarize the houses visited by a group of santas."""
+
+    total: int
+    per_santa: np.ndarray
+    shared: int
+
+
+def santa_paths(moves: bytes, num_santas: int = 1) -> np.ndarray:
+    """Return packed positions, one column per santa, starting at the origin.
+
+    Moves are dealt to the santas in turn. Santas who run out of moves before the
+    others stay put, which does not change the set of houses they visit.
+    """
+    raw = np.frombuffer(moves, dtype=np.uint8)
+    deltas = DELTAS[raw[IS_MOVE[raw]]]
+    rows = -(-deltas.size // num_santas)
+    paths = np.zeros((rows + 1, num_santas), dtype=np.int64)
+    paths.reshape(-1)[num_santas : num_santas + deltas.size] = deltas
+    return np.cumsum(paths, axis=0, out=paths)
+
+
+def house_counts(moves: bytes, num_santas: int = 1) -> HouseCounts:
+    """Count the houses visited in total, by each santa and by several santas."""
+    paths = santa_paths(moves, num_santas)
+    paths.sort(axis=0)
+    first_visit = np.ones(paths.shape, dtype=bool)
+    first_visit[1:] = paths[1:] != paths[:-1]
+    _, visitors = np.unique(paths[first_visit], return_counts=True)
+    return HouseCounts(
+        visitors.size, first_visit.sum(axis=0), int(np.count_nonzero(visitors > 1))
+    )
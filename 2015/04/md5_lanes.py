@@ -0,0 +1,163 @@
+"""Batched MD5 over NumPy ``uint32`` lanes for Day 4 candidate hashes.
+
+Each candidate message ``key + str(k)`` fits in a single 64-byte MD5 block, so
+a batch of candidates is laid out as sixteen ``uint32`` words per lane and all
+64 rounds run as whole-array operations.
+"""
+
+from __future__ import annotations
+
+from hashlib import md5
+from math import floor, sin
+from sys import argv
+from time import perf_counter
+from typing import Final
+
+import numpy as np
+from rich.console import Console
+
+BATCH_SIZE: Final[int] = 1 << 16
+MAX_MESSAGE: Final[int] = 55  # Longest message fitting one block with padding
+
+SHIFTS: Final[list[int]] = [
+    s
+    for group in ([7, 12, 17, 22], [5, 9, 14, 20], [4, 11, 16, 23], [6, 10, 15, 21])
+    for s in group * 4
+]
+CONSTANTS: Final[list[np.uint32]] = [
+    np.uint32(floor(abs(sin(i + 1)) * 2**32)) for i in range(64)
+]
+INITIAL: Final[tuple[int, int, int, int]] = (
+    0x67452301,
+    0xEFCDAB89,
+    0x98BADCFE,
+    0x10325476,
+)
+
+
+def message_index(i: int) -> int:
+    """Return the message word used in round ``i``."""
+    if i < 16:
+        return i
+    elif i < 32:
+        return (5 * i + 1) % 16
+    elif i < 48:
+        return (3 * i + 5) % 16
+    return (7 * i) % 16
+
+
+def md5_blocks(words: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Hash an ``(N, 16)`` array of single, already padded message blocks.
+
+    Returns the four state words; the digest is their little-endian bytes.
+    """
+    m = [np.ascontiguousarray(words[:, j]) for j in range(16)]
+    a, b, c, d = (np.full(len(words), x, dtype=np.uint32) for x in INITIAL)
+    for i in range(64):
+        if i < 16:
+            f = (b & c) | (~b & d)
+        elif i < 32:
+            f = (d & b) | (~d & c)
+        elif i < 48:
+            f = b ^ c ^ d
+        else:
+            f = c ^ (b | ~d)
+        f += a
+        f += CONSTANTS[i]
+        f += m[message_index(i)]
+        a, d, c = d, c, b
+        b = b + ((f << np.uint32(SHIFTS[i])) | (f >> np.uint32(32 - SHIFTS[i])))
+    return tuple(x + np.uint32(y) for x, y in zip((a, b, c, d), INITIAL))
+
+
+def candidate_blocks(prefix: bytes, start: int, stop: int) -> np.ndarray:
+    """Build padded blocks for ``prefix + str(k)`` with ``k`` in ``[start, stop)``.
+
+    Every ``k`` in the range must have the same number of digits.
+    """
+    num_digits = len(str(start))
+    if len(str(stop - 1)) != num_digits:
+        raise ValueError(f"{start} and {stop - 1} have different lengths")
+    length = len(prefix) + num_digits
+    if length > MAX_MESSAGE:
+        raise ValueError(f"Message of {length} bytes does not fit in one block")
+    blocks = np.zeros((stop - start, 64), dtype=np.uint8)
+    blocks[:, : len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+    ks = np.arange(start, stop, dtype=np.int64)
+    for j in range(num_digits):
+        place = 10 ** (num_digits - 1 - j)
+        blocks[:, len(prefix) + j] = ks // place % 10 + ord("0")
+    blocks[:, length] = 0x80
+    blocks[:, 56:] = np.frombuffer((8 * length).to_bytes(8, "little"), np.uint8)
+    return blocks.view("<u4")
+
+
+def zero_masks(num_zeros: int) -> list[int]:
+    """Return masks over the state words covering the first ``num_zeros`` nibbles."""
+    masks = [0, 0, 0, 0]
+    for nibble in range(num_zeros):
+        byte = nibble // 2
+        shift = 8 * (byte % 4) + (4 if nibble % 2 == 0 else 0)
+        masks[byte // 4] |= 0xF << shift
+    return masks
+
+
+def digit_ranges(start: int, stop: int) -> list[tuple[int, int]]:
+    """Split ``[start, stop)`` into ranges of numbers with equal digit counts."""
+    ranges = []
+    while start < stop:
+        end = min(stop, 10 ** len(str(start)))
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def search_range(key: str, start: int, stop: int, num_zeros: int) -> int | None:
+    """Return the lowest ``k`` in ``[start, stop)`` whose hash has the zeros."""
+    prefix = key.encode()
+    masks = zero_masks(num_zeros)
+    for lo, hi in digit_ranges(start, stop):
+        for batch in range(lo, hi, BATCH_SIZE):
+            state = md5_blocks(
+                candidate_blocks(prefix, batch, min(batch + BATCH_SIZE, hi))
+            )
+            ok = np.ones(len(state[0]), dtype=bool)
+            for word, mask in zip(state, masks):
+                if mask:
+                    ok &= (word & np.uint32(mask)) == 0
+            if (hits := np.flatnonzero(ok)).size:
+                return batch + int(hits[0])
+    return None
+
+
+def find_lowest(key: str, num_zeros: int = 5) -> int:
+    """Find the lowest positive ``k`` whose hash begins with ``num_zeros`` zeros."""
+    start = 1
+    while (k := search_range(key, start, start * 10, num_zeros)) is None:
+        start *= 10
+    return k
+
+
+def benchmark(key: str = "abcdef", count: int = 1_000_000) -> dict[str, float]:
+    """Measure hashes per second for the hashlib and NumPy lane paths."""
+    prefix = md5(key.encode(), usedforsecurity=False)
+    start, stop = 10**6, 10**6 + count
+    tic = perf_counter()
+    for k in range(start, stop):
+        h = prefix.copy()
+        h.update(str(k).encode())
+        h.digest()
+    hashlib_time = perf_counter() - tic
+    tic = perf_counter()
+    search_range(key, start, stop, 32)  # Never matches, so hashes every k
+    lanes_time = perf_counter() - tic
+    return {"hashlib": count / hashlib_time, "numpy lanes": count / lanes_time}
+
+
+if __name__ == "__main__":
+    c = Console()
+    key = argv[1] if len(argv) > 1 else "abcdef"
+    count = int(argv[2]) if len(argv) > 2 else 1_000_000
+    results = benchmark(key, count)
+    for name, rate in results.items():
+        c.print(f"[cyan on black]{name}[/]: [yellow on black]{rate:,.0f} hashes/s[/]")
@@ -0,0 +1,200 @@
+"""Multi-process search for Day 4 hashes with leading zeros."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from hashlib import md5
+from time import monotonic
+from typing import Final, TypeVar
+
+BLOCK_SIZE: Final[int] = 50_000
+CHECKPOINT_INTERVAL: Final[float] = 30.0  # seconds
+
+T = TypeVar("T")
+
+
+def search_block(key: str, start: int, stop: int, num_zeros: int) -> int | None:
+    """Return the lowest ``k`` in ``range(start, stop)`` that works, if any."""
+    full_bytes, half_byte = divmod(num_zeros, 2)
+    zero_bytes = bytes(full_bytes)
+    prefix = md5(key.encode(), usedforsecurity=False)
+    for k in range(start, stop):
+        h = prefix.copy()
+        h.update(str(k).encode())
+        digest = h.digest()
+        if digest.startswith(zero_bytes) and (
+            not half_byte or digest[full_bytes] < 0x10
+        ):
+            return k
+    return None
+
+
+def scan_block(
+    key: str, start: int, stop: int, min_zeros: int
+) -> list[tuple[int, int]]:
+    """Return ``(k, zeros)`` for each ``k`` in the block with at least ``min_zeros``."""
+    full_bytes = min_zeros // 2
+    zero_bytes = bytes(full_bytes)
+    prefix = md5(key.encode(), usedforsecurity=False)
+    hits = []
+    for k in range(start, stop):
+        h = prefix.copy()
+        h.update(str(k).encode())
+        digest = h.digest()
+        if digest.startswith(zero_bytes):
+            zeros = (128 - int.from_bytes(digest, "big").bit_length()) // 4
+            if zeros >= min_zeros:
+                hits.append((k, zeros))
+    return hits
+
+
+def ordered_blocks(
+    fcn: Callable[[str, int, int, int], T],
+    key: str,
+    num_zeros: int,
+    start: int = 1,
+    block_size: int = BLOCK_SIZE,
+    max_workers: int | None = None,
+) -> Generator[tuple[int, T], None, None]:
+    """Run ``fcn`` over consecutive blocks in a process pool.
+
+    Yields ``(stop, result)`` for each block in order, where ``stop`` is the end
+    of the block. Blocks are submitted ahead of the consumer; the pool is shut
+    down when the generator is closed.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[tuple[int, Future[T]]] = deque()
+    next_start = start
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                next_stop = next_start + block_size
+                pending.append(
+                    (
+                        next_stop,
+                        executor.submit(fcn, key, next_start, next_stop, num_zeros),
+                    )
+                )
+                next_start = next_stop
+            stop, future = pending.popleft()
+            yield stop, future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def mine(
+    key: str,
+    num_zeros: int = 5,
+    block_size: int = BLOCK_SIZE,
+    max_workers: int | None = None,
+) -> int:
+    """Find the lowest ``k`` using a pool of worker processes.
+
+    The integers from 1 upward are split into blocks that are handed out in
+    order. Results are collected in the same order, so the first block that
+    reports a hit holds the lowest qualifying ``k``.
+    """
+    blocks = ordered_blocks(
+        search_block, key, num_zeros, block_size=block_size, max_workers=max_workers
+    )
+    with closing(blocks):
+        for _, k in blocks:
+            if k is not None:
+                return k
+    raise AssertionError("unreachable")
+
+
+@dataclass
+class Checkpoint:
+    """Progress of a search for several numbers of leading zeros.
+
+    Every ``k`` below ``next_start`` has been checked. ``found`` maps each
+    number of zeros (of at least ``min_zeros``) seen so far to the lowest ``k``
+    giving at least that many.
+    """
+
+    key: str
+    min_zeros: int
+    next_start: int
+    found: dict[int, int]
+
+    @classmethod
+    def load(
+        cls: type[Checkpoint], filename: str | None, key: str, min_zeros: int
+    ) -> Checkpoint:
+        """Resume from ``filename`` if it holds a compatible search."""
+        fresh = cls(key, min_zeros, 1, {})
+        if filename is None:
+            return fresh
+        try:
+            with open(filename, "rt") as infile:
+                saved = json.load(infile)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return fresh
+        if saved.get("key") != key or saved.get("min_zeros", min_zeros + 1) > min_zeros:
+            return fresh
+        return cls(
+            key,
+            saved["min_zeros"],
+            saved["next_start"],
+            {int(z): k for z, k in saved["found"].items()},
+        )
+
+    def save(self: Checkpoint, filename: str) -> None:
+        """Write the checkpoint, replacing any older one atomically."""
+        with open(f"{filename}.tmp", "wt") as outfile:
+            json.dump(asdict(self), outfile)
+        os.replace(f"{filename}.tmp", filename)
+
+    def record(self: Checkpoint, hits: list[tuple[int, int]], stop: int) -> None:
+        """Record the hits (in increasing order of ``k``) from a finished block."""
+        for k, zeros in hits:
+            for z in range(self.min_zeros, zeros + 1):
+                self.found.setdefault(z, k)
+        self.next_start = stop
+
+
+def mine_all(
+    key: str,
+    difficulties: Iterable[int],
+    checkpoint_file: str | None = None,
+    checkpoint_interval: float = CHECKPOINT_INTERVAL,
+    block_size: int = BLOCK_SIZE,
+    max_workers: int | None = None,
+) -> dict[int, int]:
+    """Find the lowest ``k`` for each number of zeros in a single sweep.
+
+    If ``checkpoint_file`` is given, progress is saved there every
+    ``checkpoint_interval`` seconds and when the search finishes, and an
+    interrupted search with the same key picks up where it left off.
+    """
+    wanted = sorted(set(difficulties))
+    state = Checkpoint.load(checkpoint_file, key, wanted[0])
+    last_save = monotonic()
+    if not all(z in state.found for z in wanted):
+        blocks = ordered_blocks(
+            scan_block,
+            key,
+            state.min_zeros,
+            state.next_start,
+            block_size,
+            max_workers,
+        )
+        with closing(blocks):
+            for stop, hits in blocks:
+                state.record(hits, stop)
+                if all(z in state.found for z in wanted):
+                    break
+                if checkpoint_file and monotonic() - last_save > checkpoint_interval:
+                    state.save(checkpoint_file)
+                    last_save = monotonic()
+    if checkpoint_file:
+        state.save(checkpoint_file)
+    return {z: state.found[z] for z in wanted}
@@ -1,9 +1,13 @@
 """Solution to day 4 of 2015 Advent of Code."""
 
+from collections.abc import Callable
+from functools import lru_cache
 from hashlib import md5
 from sys import argv
 
 from _resources import Console, interactive_loop, main, report_results
+from md5_lanes import find_lowest
+from miner import mine_all
 
 
 def hash(x: str) -> str:
@@ -11,21 +15,60 @@ def hash(x: str) -> str:
     return md5(x.encode(), usedforsecurity=False).hexdigest()
 
 
-def find_soln(key: str, num_zeros: int = 5) -> str:
-    """Find the lowest ``k`` such that ``hash(f"{key}{k}")`` begins with specified zeros."""
+def find_soln(key: str, num_zeros: int = 5, backend: str = "hashlib") -> str:
+    """Find the lowest ``k`` such that ``hash(f"{key}{k}")`` begins with specified zeros.
+
+    With ``backend="numpy"``, candidates are hashed in batches by ``md5_lanes``.
+    """
+    if backend == "numpy":
+        return str(find_lowest(key, num_zeros))
+    elif backend != "hashlib":
+        raise ValueError(f"Unknown backend: {backend}")
     k: int = 1
     while hash(f"{key}{k}")[:num_zeros] != "0" * num_zeros:
         k += 1
     return str(k)
 
 
-parts = {"Part 1": (lambda x: find_soln(x, 5)), "Part 2": (lambda x: find_soln(x, 6))}
+@lru_cache(maxsize=None)
+def both_parts(key: str) -> dict[int, int]:
+    """Find the answers to both parts in one sweep."""
+    return mine_all(key, [5, 6])
+
+
+parts = {
+    "Part 1": (lambda x: str(both_parts(x)[5])),
+    "Part 2": (lambda x: str(both_parts(x)[6])),
+}
+
+
+PART_NAMES = {5: "Part 1", 6: "Part 2"}
+
+
+def answer(num_zeros: int) -> Callable[[dict[int, int]], str]:
+    """Create a function picking one answer out of a ``mine_all`` result."""
+    return lambda x: str(x[num_zeros])
+
+
+def make_file_func(max_zeros: int = 6) -> Callable[[Console, str, str], None]:
+    """Create a function reporting results up to ``max_zeros`` for a file.
+
+    Progress is checkpointed next to the input file, so an interrupted search
+    resumes when the program is run again.
+    """
 
+    def ret_fcn(c: Console, filename: str, data: str) -> None:
+        difficulties = range(5, max_zeros + 1)
+        found = mine_all(data, difficulties, f"{filename}.checkpoint.json")
+        result_fcns = {PART_NAMES.get(z, f"{z} zeros"): answer(z) for z in difficulties}
+        report_results(filename, c, lambda x: found, result_fcns, data)
 
-def file_func(c: Console, prog_name: str, data: str) -> None:
-    """Report output from data in file."""
-    report_results(prog_name, c, lambda x: x, parts, data)
+    return ret_fcn
 
 
 if __name__ == "__main__":
-    main(argv, interactive_loop(lambda x: x, parts), file_func)
+    main(
+        argv,
+        interactive_loop(lambda x: x, parts),
+        make_file_func(int(argv[2]) if len(argv) > 2 else 6),
+    )
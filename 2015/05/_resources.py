@@ -1,6 +1,12 @@
 """Some common code to reuse in these advent puzzle solutions."""
 
+from __future__ import annotations
+
+import json
+import os
 from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from time import sleep
 from typing import TypeVar
 
 from rich.console import Console
@@ -63,3 +69,94 @@ def main(
         with open(argv[1], "rt") as infile:
             text = infile.read()
         file_fcn(c, argv[0], text)
+
+
+@dataclass
+class WatchState:
+    """Running totals for the lines of a file that have been processed so far."""
+
+    filename: str
+    offset: int
+    totals: dict[str, int]
+    rules: str = ""  # Identifies any settings that change the line functions
+
+    @classmethod
+    def load(
+        cls: type[WatchState],
+        state_file: str,
+        filename: str,
+        keys: list[str],
+        rules: str = "",
+    ) -> WatchState:
+        """Load saved totals, starting over if they do not match the file or rules."""
+        fresh = cls(os.path.abspath(filename), 0, {k: 0 for k in keys}, rules)
+        try:
+            with open(state_file, "rt") as infile:
+                saved = cls(**json.load(infile))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return fresh
+        if (
+            saved.filename != fresh.filename
+            or saved.totals.keys() != fresh.totals.keys()
+            or saved.rules != fresh.rules
+            or os.path.getsize(filename) < saved.offset  # Truncated or replaced
+        ):
+            return fresh
+        return saved
+
+    def save(self: WatchState, state_file: str) -> None:
+        """Write the totals and offset to ``state_file``."""
+        with open(state_file, "wt") as outfile:
+            json.dump(asdict(self), outfile)
+
+    def update(self: WatchState, line_fcns: dict[str, Callable[[str], int]]) -> bool:
+        """Add the contributions of any complete lines appended since the last update.
+
+        Every line, blank or not, is passed to each line function, matching how the
+        whole file would be processed.
+
+        Return True if any new lines were processed.
+        """
+        with open(self.filename, "rb") as infile:
+            infile.seek(self.offset)
+            new_data = infile.read()
+        end = new_data.rfind(b"\n") + 1  # Leave a partial last line for later
+        if end == 0:
+            return False
+        for line in new_data[:end].decode().splitlines():
+            for key, fcn in line_fcns.items():
+                self.totals[key] += fcn(line)
+        self.offset += end
+        return True
+
+
+def watch_main(
+    argv: list[str], line_fcns: dict[str, Callable[[str], int]], rules: str = ""
+) -> None:
+    """Keep running totals for a growing file.
+
+    Usage: ``prog --watch filename [seconds]``. The totals and the offset reached
+    are kept in ``filename.watch.json``, so each run only processes new lines. If
+    ``seconds`` is given, poll the file at that interval until interrupted.
+    ``rules`` identifies the settings behind ``line_fcns``; totals saved under
+    different rules are discarded.
+    """
+    c = Console()
+    program_prefix = f"[green on black]{argv[0]}:[/] "
+    filename = argv[2]
+    state_file = f"{filename}.watch.json"
+    interval = float(argv[3]) if len(argv) > 3 else None
+    state = WatchState.load(state_file, filename, list(line_fcns), rules)
+    first = True
+    while True:
+        if state.update(line_fcns) or first:
+            state.save(state_file)
+            for key, value in state.totals.items():
+                c.print(
+                    program_prefix
+                    + f"[cyan on black]{key}[/]: [yellow on black]{value}[/]"
+                )
+            first = False
+        if interval is None:
+            return
+        sleep(interval)
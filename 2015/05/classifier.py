@@ -0,0 +1,194 @@
+"""Single-pass classification of Day 5 strings under both sets of rules."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Final
+
+import numpy as np
+
+IS_VOWEL: Final[np.ndarray] = np.zeros(256, dtype=bool)
+IS_VOWEL[list(b"aeiou")] = True
+IS_BREAK: Final[np.ndarray] = np.zeros(256, dtype=bool)
+IS_BREAK[list(b"\r\n")] = True
+
+# Position of each lowercase letter in the alphabet, -1 for anything else
+LETTER_INDEX: Final[np.ndarray] = np.full(256, -1, dtype=np.int64)
+LETTER_INDEX[ord("a") : ord("z") + 1] = np.arange(26)
+
+LONG_WORD: Final[int] = 64  # Longer words are checked for forbidden substrings alone
+
+DEFAULT_FORBIDDEN: Final[frozenset[str]] = frozenset(["ab", "cd", "pq", "xy"])
+
+
+@dataclass(frozen=True)
+class ForbiddenMatcher:
+    """Aho-Corasick automaton recognizing any of a set of forbidden substrings.
+
+    State 0 is the root. ``terminal[state]`` is True if some forbidden substring
+    ends at that state (directly or via its failure links), so the cost per byte
+    does not depend on how many substrings there are.
+    """
+
+    goto: list[dict[int, int]]
+    fail: list[int]
+    terminal: list[bool]
+
+    @classmethod
+    def from_patterns(
+        cls: type[ForbiddenMatcher], patterns: Iterable[str]
+    ) -> ForbiddenMatcher:
+        """Build the automaton for a collection of substrings."""
+        goto: list[dict[int, int]] = [{}]
+        terminal = [False]
+        for pattern in patterns:
+            if not pattern:
+                raise ValueError("Forbidden substrings must not be empty")
+            state = 0
+            for byte in pattern.encode():
+                if (next_state := goto[state].get(byte)) is None:
+                    next_state = len(goto)
+                    goto[state][byte] = next_state
+                    goto.append({})
+                    terminal.append(False)
+                state = next_state
+            terminal[state] = True
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for byte, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and byte not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(byte, 0)
+                terminal[next_state] |= terminal[fail[next_state]]
+                queue.append(next_state)
+        return cls(goto, fail, terminal)
+
+    @cached_property
+    def table(self: ForbiddenMatcher) -> np.ndarray:
+        """Return the full transition table, indexed by ``[state, byte]``.
+
+        Rows are filled breadth first, so each state's failure target (which is
+        shallower) is already done and its row can be copied.
+        """
+        table = np.zeros((len(self.goto), 256), dtype=np.int32)
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            if state:
+                table[state] = table[self.fail[state]]
+            for byte, next_state in self.goto[state].items():
+                table[state, byte] = next_state
+                queue.append(next_state)
+        return table
+
+    def found_in(self: ForbiddenMatcher, word: bytes) -> bool:
+        """Return True if a forbidden substring occurs in ``word``."""
+        goto, fail, terminal = self.goto, self.fail, self.terminal
+        state = 0
+        for byte in word:
+            while state and byte not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(byte, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+@lru_cache(maxsize=None)
+def compile_forbidden(patterns: frozenset[str] = DEFAULT_FORBIDDEN) -> ForbiddenMatcher:
+    """Return the (cached) automaton for a set of forbidden substrings."""
+    return ForbiddenMatcher.from_patterns(sorted(patterns))
+
+
+def count_nice(buf: bytes, matcher: ForbiddenMatcher | None = None) -> tuple[int, int]:
+    """Count the nice words (Part 1, Part 2) in a buffer of newline-separated words.
+
+    The vowel, double-letter and sandwich rules compare shifted views of the
+    whole buffer and are gathered per word. For the Part 2 pair rule, the letter
+    pairs are grouped by word and pair with one sort; a pair occurs twice without
+    overlapping exactly when its first and last occurrences end at least two
+    bytes apart. Only words that pass the other Part 1 rules are fed to
+    ``matcher`` (by default, the Part 1 forbidden substrings).
+    """
+    if matcher is None:
+        matcher = compile_forbidden()
+    raw = np.frombuffer(buf, dtype=np.uint8)
+    is_break = IS_BREAK[raw]
+    word = np.cumsum(is_break)  # A line break starts the next word
+    breaks = np.flatnonzero(is_break)
+    starts = np.append(0, breaks + 1)
+    lengths = np.append(breaks, raw.size) - starts
+    in_word = ~is_break
+
+    def words_where(ends: np.ndarray) -> np.ndarray:
+        """Flag each word containing one of the ``ends`` positions."""
+        flags = np.zeros(len(starts), dtype=bool)
+        flags[word[ends]] = True
+        return flags
+
+    vowels = np.bincount(word[IS_VOWEL[raw]], minlength=len(starts))
+    double = words_where(np.flatnonzero((raw[1:] == raw[:-1]) & in_word[1:]) + 1)
+    sandwich = words_where(
+        np.flatnonzero((raw[2:] == raw[:-2]) & in_word[2:] & in_word[1:-1]) + 2
+    )
+
+    candidates = np.flatnonzero((vowels >= 3) & double)
+    forbidden = _forbidden_words(raw, starts, lengths, candidates, matcher)
+    nice1 = len(candidates) - int(np.count_nonzero(forbidden[candidates]))
+
+    letter = LETTER_INDEX[raw]
+    ends = np.flatnonzero((letter[1:] >= 0) & (letter[:-1] >= 0)) + 1
+    ends = ends[sandwich[word[ends]]]
+    keys = 676 * word[ends] + 26 * letter[ends - 1] + letter[ends]
+    order = np.argsort(keys, kind="stable")  # Keeps each group in position order
+    keys, ends = keys[order], ends[order]
+    new_group = np.diff(keys, prepend=-1) != 0
+    last_in_group = np.diff(keys, append=-1) != 0
+    twice = ends[last_in_group] - ends[new_group] >= 2
+    pair_twice = words_where(ends[new_group][twice])
+    nice2 = int(np.count_nonzero(sandwich & pair_twice))
+    return nice1, nice2
+
+
+def _forbidden_words(
+    raw: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    candidates: np.ndarray,
+    matcher: ForbiddenMatcher,
+) -> np.ndarray:
+    """Flag the candidate words containing a forbidden substring.
+
+    Short words all step through the automaton's transition table together, one
+    byte position at a time, dropping out once they end or match. Long words are
+    walked one at a time, so a single huge word cannot cost one NumPy step per
+    byte.
+    """
+    table, terminal = matcher.table, np.array(matcher.terminal)
+    forbidden = np.zeros(len(starts), dtype=bool)
+    long = lengths[candidates] > LONG_WORD
+    for idx in candidates[long]:
+        start = starts[idx]
+        forbidden[idx] = matcher.found_in(raw[start : start + lengths[idx]].tobytes())
+    ids = candidates[~long]
+    pos, left = starts[ids], lengths[ids]
+    state = np.zeros(len(ids), dtype=np.int32)
+    while ids.size:
+        state = table[state, raw[pos]]
+        hit = terminal[state]
+        forbidden[ids[hit]] = True
+        keep = ~hit & (left > 1)
+        ids, pos, left, state = ids[keep], pos[keep] + 1, left[keep] - 1, state[keep]
+    return forbidden
+
+
+def classify(word: str, matcher: ForbiddenMatcher | None = None) -> tuple[bool, bool]:
+    """Return whether a single word is nice under the Part 1 and Part 2 rules."""
+    nice1, nice2 = count_nice(word.encode(), matcher)
+    return nice1 == 1, nice2 == 1
@@ -0,0 +1,73 @@
+"""Parallel classification of large Day 5 word lists in newline-aligned shards."""
+
+from __future__ import annotations
+
+import mmap
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Final
+
+from classifier import ForbiddenMatcher, compile_forbidden, count_nice
+
+SHARD_SIZE: Final[int] = 1 << 24  # 16 MiB of words per shard
+
+_worker_matcher: ForbiddenMatcher | None = None
+
+
+def newline_shards(
+    buf: bytes | mmap.mmap, shard_size: int = SHARD_SIZE
+) -> Iterator[tuple[int, int]]:
+    """Yield ``(start, stop)`` offsets of shards that end on a line break."""
+    start = 0
+    while start < len(buf):
+        stop = start + shard_size
+        if stop >= len(buf):
+            stop = len(buf)
+        else:
+            newline = buf.rfind(b"\n", start, stop)
+            if newline == -1:  # A line longer than a shard
+                newline = buf.find(b"\n", stop)
+            stop = len(buf) if newline == -1 else newline + 1
+        yield start, stop
+        start = stop
+
+
+def _init_worker(matcher: ForbiddenMatcher) -> None:
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _count_shard(filename: str, start: int, stop: int) -> tuple[int, int]:
+    with open(filename, "rb") as infile, mmap.mmap(
+        infile.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        return count_nice(mm[start:stop], _worker_matcher)
+
+
+def count_nice_file(
+    filename: str,
+    matcher: ForbiddenMatcher | None = None,
+    shard_size: int = SHARD_SIZE,
+    max_workers: int | None = None,
+) -> tuple[int, int]:
+    """Count the nice words (Part 1, Part 2) in a file using a process pool.
+
+    The file is memory-mapped and split into shards at line breaks. Each worker
+    receives the matcher once, then classifies its shards under both rule sets
+    in a single pass.
+    """
+    if matcher is None:
+        matcher = compile_forbidden()
+    with open(filename, "rb") as infile:
+        if infile.seek(0, 2) == 0:
+            return 0, 0
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            bounds = list(newline_shards(mm, shard_size))
+    starts, stops = zip(*bounds)
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(matcher,)
+    ) as executor:
+        counts = list(
+            executor.map(_count_shard, [filename] * len(bounds), starts, stops)
+        )
+    return sum(k[0] for k in counts), sum(k[1] for k in counts)
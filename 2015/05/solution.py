@@ -1,21 +1,30 @@
 """Solution to day 5 of 2015 Advent of Code."""
 
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Collection
+from functools import partial
+from hashlib import sha256
 from sys import argv
 from typing import Final
 
-from _resources import Console, interactive_loop, main, report_results
+from _resources import Console, interactive_loop, report_results, watch_main
+from classifier import (
+    DEFAULT_FORBIDDEN,
+    ForbiddenMatcher,
+    classify,
+    compile_forbidden,
+)
+from shards import count_nice_file
 
 LETTER_BETWEEN: Final[re.Pattern] = re.compile(r"(?P<letter>[a-z])[a-z](?P=letter)")
 
 
-def is_nice1(x: str) -> bool:
+def is_nice1(x: str, forbidden: Collection[str] = DEFAULT_FORBIDDEN) -> bool:
     """Determine if ``x`` is nice (part 1)."""
     return (
         len([k for k in x if k in "aeiou"]) >= 3
         and any(j == k for j, k in zip(x[:-1], x[1:]))
-        and all(k not in x for k in ["ab", "cd", "pq", "xy"])
+        and all(k not in x for k in forbidden)
     )
 
 
@@ -26,25 +35,52 @@ def is_nice2(x: str) -> bool:
     ) and LETTER_BETWEEN.search(x) is not None
 
 
-INTERACTIVE_RESULTS: Final[dict[str, Callable[[str], str]]] = {
-    "Part 1": (lambda x: "Nice" if is_nice1(x) else "Naughty"),
-    "Part 2": (lambda x: "Nice" if is_nice2(x) else "Naughty"),
+INTERACTIVE_RESULTS: Final[dict[str, Callable[[tuple[bool, bool]], str]]] = {
+    "Part 1": (lambda x: "Nice" if x[0] else "Naughty"),
+    "Part 2": (lambda x: "Nice" if x[1] else "Naughty"),
 }
 
 
-def file_fcn(c: Console, prog_name: str, text: str) -> None:
-    """Parse file and display results."""
-    report_results(
-        prog_name,
-        c,
-        lambda x: x.splitlines(),
-        {
-            "Part 1": (lambda x: str(sum(is_nice1(k) for k in x))),
-            "Part 2": (lambda x: str(sum(is_nice2(k) for k in x))),
-        },
-        text,
-    )
+def line_fcns(matcher: ForbiddenMatcher) -> dict[str, Callable[[str], int]]:
+    """Create the per-line functions used by the watch mode."""
+    return {
+        "Part 1": (lambda x: classify(x, matcher)[0]),
+        "Part 2": (lambda x: classify(x, matcher)[1]),
+    }
+
+
+def rules_digest(forbidden: Collection[str]) -> str:
+    """Return an identifier for a set of forbidden substrings."""
+    return sha256("\n".join(sorted(forbidden)).encode()).hexdigest()
+
+
+FILE_RESULTS: Final[dict[str, Callable[[tuple[int, int]], str]]] = {
+    "Part 1": (lambda x: str(x[0])),
+    "Part 2": (lambda x: str(x[1])),
+}
 
 
 if __name__ == "__main__":
-    main(argv, interactive_loop(lambda x: x, INTERACTIVE_RESULTS), file_fcn)
+    # ``--forbidden RULES_FILE`` replaces the Part 1 forbidden substrings with
+    # those listed (one per line) in RULES_FILE.
+    forbidden = DEFAULT_FORBIDDEN
+    if len(argv) > 2 and argv[1] == "--forbidden":
+        with open(argv[2], "rt") as infile:
+            forbidden = frozenset(infile.read().split())
+        argv = [argv[0], *argv[3:]]
+    matcher = compile_forbidden(forbidden)
+    if len(argv) > 2 and argv[1] == "--watch":
+        watch_main(argv, line_fcns(matcher), rules_digest(forbidden))
+    elif len(argv) > 1:
+        # The file is read in shards by worker processes rather than all at once
+        report_results(
+            argv[0],
+            Console(),
+            partial(count_nice_file, matcher=matcher),
+            FILE_RESULTS,
+            argv[1],
+        )
+    else:
+        interactive_loop(partial(classify, matcher=matcher), INTERACTIVE_RESULTS)(
+            Console(), argv[0]
+        )
@@ -4,28 +4,87 @@ from __future__ import annotations
 
 import re
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
 from sys import argv
 from typing import Final
 
+import numpy as np
+
 from _resources import Console, main, make_reporter, print_help
 
 INSTR_PATTERN: Final[re.Pattern] = re.compile(
     r"([a-z ]+) (\d+),(\d+) through (\d+),(\d+)"
 )
 
-PART1_COMMANDS: Final[dict[str, Callable[[int], int]]] = {
-    "turn on": (lambda x: 1),
-    "turn off": (lambda x: 0),
-    "toggle": (lambda x: 1 if x == 0 else 0),
+# A command modifies, in place, the block of the grid it applies to (any return
+# value is ignored)
+LightOp = Callable[[np.ndarray], object]
+
+PART1_COMMANDS: Final[dict[str, LightOp]] = {
+    "turn on": (lambda x: x.fill(1)),
+    "turn off": (lambda x: x.fill(0)),
+    "toggle": (lambda x: np.bitwise_xor(x, 1, out=x)),
+}
+
+PART2_COMMANDS: Final[dict[str, LightOp]] = {
+    "turn on": (lambda x: np.add(x, 1, out=x)),
+    "turn off": (lambda x: np.clip(x - 1, 0, None, out=x)),
+    "toggle": (lambda x: np.add(x, 2, out=x)),
 }
 
-PART2_COMMANDS: Final[dict[str, Callable[[int], int]]] = {
-    "turn on": (lambda x: x + 1),
-    "turn off": (lambda x: max(0, x - 1)),
-    "toggle": (lambda x: x + 2),
+
+# Every set of command semantics to evaluate, by result name
+COMMAND_SETS: Final[dict[str, dict[str, LightOp]]] = {
+    "Part 1": PART1_COMMANDS,
+    "Part 2": PART2_COMMANDS,
 }
 
+TILES_PER_SIDE: Final[int] = 4
+SNAPSHOT_INTERVAL: Final[int] = 1_000  # Fewest steps between GridHistory snapshots
+MAX_SNAPSHOTS: Final[int] = 32  # 128 MB of 1000x1000 grids
+
+# Opcodes for the structured instruction array; -1 marks an unrecognized command
+COMMAND_NAMES: Final[list[str]] = ["turn on", "turn off", "toggle"]
+
+INSTR_DTYPE: Final[np.dtype] = np.dtype(
+    [
+        ("op", np.int8),
+        ("row_min", np.int32),
+        ("col_min", np.int32),
+        ("row_max", np.int32),
+        ("col_max", np.int32),
+    ]
+)
+
+
+def no_op(x: np.ndarray) -> None:
+    """Leave the lights unchanged (used for unrecognized commands)."""
+
+
+def parse_instructions(text: str) -> np.ndarray:
+    """Parse text commands once into a structured array of opcodes and corners."""
+    opcodes = {name: code for code, name in enumerate(COMMAND_NAMES)}
+    rows = []
+    for line in text.splitlines():
+        if m := INSTR_PATTERN.match(line):
+            x1, y1, x2, y2 = (int(m.group(k)) for k in range(2, 6))
+            rows.append(
+                (
+                    opcodes.get(m.group(1), -1),
+                    min(x1, x2),
+                    min(y1, y2),
+                    max(x1, x2),
+                    max(y1, y2),
+                )
+            )
+        else:
+            rows.append((-1, 0, 0, 0, 0))
+    return np.array(rows, dtype=INSTR_DTYPE)
+
 
 @dataclass
 class LightCommand:
@@ -33,12 +92,12 @@ class LightCommand:
 
     corner1: tuple[int, int]
     corner2: tuple[int, int]
-    state_change: Callable[[int], int]
+    state_change: LightOp
 
     @classmethod
     def parse_line(
         cls: type[LightCommand],
-        command_dict: dict[str, Callable[[int], int]],
+        command_dict: dict[str, LightOp],
         text: str,
     ) -> LightCommand:
         """Interpret a text command."""
@@ -46,38 +105,302 @@ class LightCommand:
             return cls(
                 (int(m.group(2)), int(m.group(3))),
                 (int(m.group(4)), int(m.group(5))),
-                command_dict.get(m.group(1), lambda x: x),
+                command_dict.get(m.group(1), no_op),
             )
         else:
-            return cls((0, 0), (0, 0), lambda x: x)
+            return cls((0, 0), (0, 0), no_op)
+
+    @property
+    def slices(self: LightCommand) -> tuple[slice, slice]:
+        """Return the rows and columns of the grid covered by the command."""
+        row_min = min(self.corner1[0], self.corner2[0])
+        row_max = max(self.corner1[0], self.corner2[0])
+        col_min = min(self.corner1[1], self.corner2[1])
+        col_max = max(self.corner1[1], self.corner2[1])
+        return slice(row_min, row_max + 1), slice(col_min, col_max + 1)
 
 
 class LightGrid:
     """Represents the state of the lights."""
 
-    def __init__(self: LightGrid) -> None:
+    def __init__(self: LightGrid, size: int = 1_000) -> None:
         """Initialize object (all turned off)."""
-        self.light_state = [[0 for _ in range(1_000)] for _2 in range(1_000)]
+        self.light_state = np.zeros((size, size), dtype=np.int32)
 
     @property
     def total_brightness(self: LightGrid) -> int:
         """Return the number of lit lights."""
-        return sum(sum(row) for row in self.light_state)
+        return int(self.light_state.sum(dtype=np.int64))
 
     def run_command(self: LightGrid, cmd: LightCommand) -> None:
         """Apply a LightCommand to the grid."""
-        row_min = min(cmd.corner1[0], cmd.corner2[0])
-        row_max = max(cmd.corner1[0], cmd.corner2[0])
-        col_min = min(cmd.corner1[1], cmd.corner2[1])
-        col_max = max(cmd.corner1[1], cmd.corner2[1])
-        for row in range(row_min, row_max + 1):
-            for col in range(col_min, col_max + 1):
-                self.light_state[row][col] = cmd.state_change(
-                    self.light_state[row][col]
-                )
+        cmd.state_change(self.light_state[cmd.slices])
+
+
+class CompressedGrid:
+    """Represents the state of the lights, with rows and columns merged into bands.
+
+    Only the rectangle edges used by the commands split the grid, so each cell
+    of ``light_state`` stands for a band of rows by a band of columns whose
+    lights always change together. Memory depends on the number of commands,
+    not on the size of the grid.
+    """
+
+    def __init__(self: CompressedGrid, commands: list[LightCommand]) -> None:
+        """Initialize object (all turned off) for a list of commands."""
+        rows, cols = zip(*(cmd.slices for cmd in commands)) if commands else ((), ())
+        self.row_edges = np.unique([k for s in rows for k in (s.start, s.stop)])
+        self.col_edges = np.unique([k for s in cols for k in (s.start, s.stop)])
+        num_rows = max(len(self.row_edges) - 1, 0)
+        num_cols = max(len(self.col_edges) - 1, 0)
+        self.light_state = np.zeros((num_rows, num_cols), dtype=np.int64)
+        self.area = np.outer(
+            np.diff(self.row_edges).astype(np.int64),
+            np.diff(self.col_edges).astype(np.int64),
+        )
+
+    @property
+    def total_brightness(self: CompressedGrid) -> int:
+        """Return the number of lit lights."""
+        return int((self.light_state * self.area).sum())
+
+    def _compress(self: CompressedGrid, edges: np.ndarray, span: slice) -> slice:
+        start, stop = np.searchsorted(edges, [span.start, span.stop])
+        return slice(int(start), int(stop))
+
+    def run_command(self: CompressedGrid, cmd: LightCommand) -> None:
+        """Apply a LightCommand to the grid."""
+        rows, cols = cmd.slices
+        cmd.state_change(
+            self.light_state[
+                self._compress(self.row_edges, rows),
+                self._compress(self.col_edges, cols),
+            ]
+        )
+
+
+class StackedGrid:
+    """Represents the lights under several command semantics at once.
+
+    Layer ``k`` of ``light_state`` is the grid for the ``k``-th command
+    dictionary, so one sweep over the instructions updates every layer.
+    """
+
+    def __init__(
+        self: StackedGrid, cmd_dicts: list[dict[str, LightOp]], size: int = 1_000
+    ) -> None:
+        """Initialize object (all turned off)."""
+        self.light_state = np.zeros((len(cmd_dicts), size, size), dtype=np.int32)
+        # Indexed by opcode; the trailing no_op is picked up by opcode -1
+        self.ops = [
+            [cmds.get(name, no_op) for name in COMMAND_NAMES] + [no_op]
+            for cmds in cmd_dicts
+        ]
+
+    @property
+    def total_brightness(self: StackedGrid) -> list[int]:
+        """Return the number of lit lights in each layer."""
+        return [int(k) for k in self.light_state.sum(axis=(1, 2), dtype=np.int64)]
+
+    def run_instructions(self: StackedGrid, instructions: np.ndarray) -> None:
+        """Apply an array of parsed instructions to every layer."""
+        for op, row_min, col_min, row_max, col_max in instructions.tolist():
+            rows = slice(row_min, row_max + 1)
+            cols = slice(col_min, col_max + 1)
+            for layer, ops in zip(self.light_state, self.ops):
+                ops[op](layer[rows, cols])
+
+
+# Per-process state of the TiledGrid workers, set up by _init_tile_worker
+_tile_shm: SharedMemory | None = None
+_tile_state: np.ndarray | None = None
+_tile_ops: list[LightOp] = []
+_tile_instructions: np.ndarray | None = None
+
+
+def _init_tile_worker(
+    shm_name: str, size: int, ops: list[LightOp], instructions: np.ndarray
+) -> None:
+    global _tile_shm, _tile_state, _tile_ops, _tile_instructions
+    _tile_shm = SharedMemory(name=shm_name)
+    _tile_state = np.ndarray((size, size), dtype=np.int32, buffer=_tile_shm.buf)
+    _tile_ops = ops
+    _tile_instructions = instructions
+
+
+def _run_tile(bounds: tuple[int, int, int, int]) -> int:
+    """Apply every instruction, clipped to one tile, and return the tile's total."""
+    assert _tile_state is not None and _tile_instructions is not None
+    top, left, bottom, right = bounds
+    tile = _tile_state[top:bottom, left:right]
+    instrs = _tile_instructions
+    overlaps = (
+        (instrs["row_min"] < bottom)
+        & (instrs["row_max"] >= top)
+        & (instrs["col_min"] < right)
+        & (instrs["col_max"] >= left)
+    )
+    for op, row_min, col_min, row_max, col_max in instrs[overlaps].tolist():
+        _tile_ops[op](
+            tile[
+                max(row_min, top) - top : min(row_max + 1, bottom) - top,
+                max(col_min, left) - left : min(col_max + 1, right) - left,
+            ]
+        )
+    return int(tile.sum(dtype=np.int64))
+
 
+class TiledGrid:
+    """Represents the state of the lights in shared memory, split into tiles.
 
-def create_grid(cmd_dict: dict[str, Callable[[int], int]], text: str) -> LightGrid:
+    Each worker process clips every instruction to its tile and applies it
+    there, so the tiles are updated in parallel. The worker processes are
+    forked, which lets them inherit the command functions (lambdas cannot be
+    pickled). Use as a context manager, or call ``close``, to free the memory.
+    """
+
+    def __init__(
+        self: TiledGrid,
+        cmd_dict: dict[str, LightOp],
+        size: int = 1_000,
+        tiles_per_side: int = TILES_PER_SIDE,
+    ) -> None:
+        """Initialize object (all turned off)."""
+        self.size = size
+        self.shm = SharedMemory(create=True, size=size * size * 4)
+        self.light_state.fill(0)
+        self.ops = [cmd_dict.get(name, no_op) for name in COMMAND_NAMES] + [no_op]
+        edges = [size * k // tiles_per_side for k in range(tiles_per_side + 1)]
+        self.tiles = [
+            (top, left, bottom, right)
+            for top, bottom in zip(edges[:-1], edges[1:])
+            for left, right in zip(edges[:-1], edges[1:])
+        ]
+        self.tile_totals = [0] * len(self.tiles)
+
+    def __enter__(self: TiledGrid) -> TiledGrid:
+        """Return the grid itself."""
+        return self
+
+    def __exit__(self: TiledGrid, *args) -> None:
+        """Free the shared memory."""
+        self.close()
+
+    @property
+    def light_state(self: TiledGrid) -> np.ndarray:
+        """Return a view of the grid (which must not outlive ``close``)."""
+        return np.ndarray((self.size, self.size), dtype=np.int32, buffer=self.shm.buf)
+
+    @property
+    def total_brightness(self: TiledGrid) -> int:
+        """Return the number of lit lights, from the per-tile totals."""
+        return sum(self.tile_totals)
+
+    def run_instructions(
+        self: TiledGrid, instructions: np.ndarray, max_workers: int | None = None
+    ) -> None:
+        """Apply an array of parsed instructions using a pool of worker processes."""
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=get_context("fork"),
+            initializer=_init_tile_worker,
+            initargs=(self.shm.name, self.size, self.ops, instructions),
+        ) as executor:
+            self.tile_totals = list(executor.map(_run_tile, self.tiles))
+
+    def close(self: TiledGrid) -> None:
+        """Release and remove the shared memory."""
+        self.shm.close()
+        self.shm.unlink()
+
+
+class GridHistory:
+    """Answers questions about the lights part way through a list of instructions.
+
+    "Step ``k``" means after the first ``k`` instructions. The whole list is
+    replayed once, recording how many lights each instruction changed and by how
+    much it changed the total brightness, and keeping a copy of the grid every
+    ``snapshot_interval`` steps. Totals are then looked up directly, and the
+    state of one light is found by replaying, for that light alone, the
+    instructions since the closest earlier snapshot.
+
+    Each snapshot is a full ``size`` by ``size`` grid, so for long lists the
+    interval is widened so that at most ``max_snapshots`` follow the starting
+    grid. This bounds the memory used, at the cost of replaying up to about
+    ``len(instructions) / max_snapshots`` instructions per ``light_at`` call.
+    """
+
+    def __init__(
+        self: GridHistory,
+        cmd_dict: dict[str, LightOp],
+        instructions: np.ndarray,
+        size: int = 1_000,
+        snapshot_interval: int = SNAPSHOT_INTERVAL,
+        max_snapshots: int = MAX_SNAPSHOTS,
+    ) -> None:
+        """Replay the instructions, recording changes and snapshots."""
+        self.ops = [cmd_dict.get(name, no_op) for name in COMMAND_NAMES] + [no_op]
+        self.instructions = instructions
+        snapshot_interval = max(
+            snapshot_interval, -(-len(instructions) // max_snapshots)
+        )
+        self.snapshot_interval = snapshot_interval
+        self.area_changed = np.zeros(len(instructions), dtype=np.int64)
+        self.brightness_delta = np.zeros(len(instructions), dtype=np.int64)
+        light_state = np.zeros((size, size), dtype=np.int32)
+        self.snapshots = [light_state.copy()]
+        for step, (op, row_min, col_min, row_max, col_max) in enumerate(
+            instructions.tolist(), start=1
+        ):
+            region = light_state[row_min : row_max + 1, col_min : col_max + 1]
+            before = region.copy()
+            self.ops[op](region)
+            self.area_changed[step - 1] = np.count_nonzero(region != before)
+            delta = region.sum(dtype=np.int64) - before.sum(dtype=np.int64)
+            self.brightness_delta[step - 1] = delta
+            if step % snapshot_interval == 0:
+                self.snapshots.append(light_state.copy())
+        self.totals = np.zeros(len(instructions) + 1, dtype=np.int64)
+        np.cumsum(self.brightness_delta, out=self.totals[1:])
+
+    def _check_step(self: GridHistory, step: int) -> None:
+        if not 0 <= step <= len(self.instructions):
+            raise ValueError(
+                f"Step {step} outside of range 0 to {len(self.instructions)}"
+            )
+
+    def brightness_after(self: GridHistory, step: int) -> int:
+        """Return the total brightness after the first ``step`` instructions."""
+        self._check_step(step)
+        return int(self.totals[step])
+
+    def light_at(self: GridHistory, row: int, col: int, step: int) -> int:
+        """Return the brightness of one light after the first ``step`` instructions."""
+        self._check_step(step)
+        snapshot = step // self.snapshot_interval
+        light = self.snapshots[snapshot][row : row + 1, col : col + 1].copy()
+        instrs = self.instructions[snapshot * self.snapshot_interval : step]
+        covers = (
+            (instrs["row_min"] <= row)
+            & (instrs["row_max"] >= row)
+            & (instrs["col_min"] <= col)
+            & (instrs["col_max"] >= col)
+        )
+        for op in instrs["op"][covers].tolist():
+            self.ops[op](light)
+        return int(light[0, 0])
+
+
+def stacked_totals(
+    cmd_sets: dict[str, dict[str, LightOp]], text: str
+) -> dict[str, int]:
+    """Parse the instructions once and evaluate every set of commands."""
+    lights = StackedGrid(list(cmd_sets.values()))
+    lights.run_instructions(parse_instructions(text))
+    return dict(zip(cmd_sets, lights.total_brightness))
+
+
+def create_grid(cmd_dict: dict[str, LightOp], text: str) -> LightGrid:
     """Apply a list of text commands to a new LightGrid."""
     lights = LightGrid()
     for line in text.splitlines():
@@ -85,19 +408,92 @@ def create_grid(cmd_dict: dict[str, Callable[[int], int]], text: str) -> LightGr
     return lights
 
 
-def soln_fcn(cmd_dict: dict[str, Callable[[int], int]]) -> Callable[[str], str]:
+def create_compressed_grid(cmd_dict: dict[str, LightOp], text: str) -> CompressedGrid:
+    """Apply a list of text commands to a new CompressedGrid."""
+    commands = [LightCommand.parse_line(cmd_dict, line) for line in text.splitlines()]
+    lights = CompressedGrid(commands)
+    for cmd in commands:
+        lights.run_command(cmd)
+    return lights
+
+
+def create_tiled_grid(cmd_dict: dict[str, LightOp], text: str) -> TiledGrid:
+    """Apply a list of text commands to a new TiledGrid.
+
+    The shared memory is released before returning; the per-tile totals remain.
+    """
+    with TiledGrid(cmd_dict) as lights:
+        lights.run_instructions(parse_instructions(text))
+    return lights
+
+
+GRID_BACKENDS: Final[
+    dict[
+        str,
+        Callable[[dict[str, LightOp], str], LightGrid | CompressedGrid | TiledGrid],
+    ]
+] = {
+    "dense": create_grid,
+    "compressed": create_compressed_grid,
+    "tiled": create_tiled_grid,
+}
+
+
+def soln_fcn(
+    cmd_dict: dict[str, LightOp], backend: str = "dense"
+) -> Callable[[str], str]:
     """Create a function applying the command dictionary to a set of text instructions."""
+    grid_fcn = GRID_BACKENDS[backend]
 
     def ret_fcn(text: str) -> str:
-        return str(create_grid(cmd_dict, text).total_brightness)
+        return str(grid_fcn(cmd_dict, text).total_brightness)
 
     return ret_fcn
 
 
-RESULT_FUNCTIONS: Final[dict[str, Callable[[str], str]]] = {
-    "Part 1": soln_fcn(PART1_COMMANDS),
-    "Part 2": soln_fcn(PART2_COMMANDS),
-}
+def result_functions(backend: str = "dense") -> dict[str, Callable[[str], str]]:
+    """Create the result functions using one of the GRID_BACKENDS."""
+    return {name: soln_fcn(cmds, backend) for name, cmds in COMMAND_SETS.items()}
+
+
+RESULT_FUNCTIONS: Final[dict[str, Callable[[str], str]]] = result_functions()
+
+
+def pick_total(name: str) -> Callable[[dict[str, int]], str]:
+    """Create a function reporting one of the totals from ``stacked_totals``."""
+    return lambda x: str(x[name])
+
+
+def make_file_fcn(backend: str = "stacked") -> Callable[[Console, str, str], None]:
+    """Create a file_fcn evaluating every entry of COMMAND_SETS with a backend.
+
+    The default ``"stacked"`` backend parses once and evaluates all the command
+    sets in a single sweep; any other name is looked up in GRID_BACKENDS.
+    Raises ``ValueError`` for an unknown backend.
+    """
+    if backend not in BACKEND_NAMES:
+        raise ValueError(
+            f"Unknown backend {backend!r}; choose from {', '.join(BACKEND_NAMES)}"
+        )
+    if backend == "stacked":
+        return make_reporter(
+            partial(stacked_totals, COMMAND_SETS),
+            {name: pick_total(name) for name in COMMAND_SETS},
+        )
+    return make_reporter(lambda x: x, result_functions(backend))
+
+
+BACKEND_NAMES: Final[tuple[str, ...]] = ("stacked", *GRID_BACKENDS)
+
 
 if __name__ == "__main__":
-    main(argv, print_help, make_reporter(lambda x: x, RESULT_FUNCTIONS))
+    # An optional second argument names the grid backend
+    if len(argv) > 2 and argv[2] not in BACKEND_NAMES:
+        c = Console()
+        c.print(f"[white on red]Unknown backend:[/] {argv[2]}")
+        c.print(
+            f"[white on red]Usage:[/] [yellow on black]{argv[0]}[/] filename "
+            f"\\[{'|'.join(BACKEND_NAMES)}]"
+        )
+    else:
+        main(argv, print_help, make_file_fcn(*argv[2:3]))
@@ -0,0 +1,506 @@
+"""Compiled, iterative evaluation of Day 7 circuits."""
+
+from __future__ import annotations
+
+import re
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from typing import TYPE_CHECKING, Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from solution import EvaluationState
+
+# Opcodes; those above NOT take two operands
+ASSIGN, NOT, AND, OR, LSHIFT, RSHIFT = range(6)
+OPCODES: Final[dict[str | None, int]] = {
+    None: ASSIGN,
+    "NOT": NOT,
+    "AND": AND,
+    "OR": OR,
+    "LSHIFT": LSHIFT,
+    "RSHIFT": RSHIFT,
+}
+
+# Bits of ``Netlist.flags``: set if the operand is a literal rather than a wire
+A_IMMEDIATE: Final[int] = 1
+B_IMMEDIATE: Final[int] = 2
+DEFINED: Final[int] = 4  # Set once the wire's gate has been added
+MASK: Final[int] = 0xFFFF
+MAX_REPORTED_CYCLE: Final[int] = 10  # Longest cycle listed in full in errors
+
+# One line of puzzle input: ``[[val1] op] val2 -> target``, or anything else as
+# the last group
+GATE_PATTERN: Final[re.Pattern] = re.compile(
+    r"^(?:(?:(?:([a-z]+|\d+) )?([A-Z]+) )?([a-z]+|\d+) -> ([a-z]+)|(.+?))\r?$",
+    re.MULTILINE,
+)
+
+
+@dataclass
+class Netlist:
+    """Represent the gates of a circuit as parallel arrays indexed by wire ID.
+
+    The gate driving wire ``w`` computes ``a[w] op[w] b[w]``. Single-operand
+    gates (assignment and ``NOT``) only use ``b[w]``, following
+    ``AssignmentExpression.val2``.
+    """
+
+    names: list[str]
+    ids: dict[str, int]
+    op: array
+    a: array
+    b: array
+    flags: array
+
+    @classmethod
+    def empty(cls: type[Netlist]) -> Netlist:
+        """Create a netlist without any wires."""
+        return cls([], {}, array("B"), array("I"), array("I"), array("B"))
+
+    def wire_id(self: Netlist, name: str) -> int:
+        """Return the ID of a wire, interning its name if it is new."""
+        if (wire := self.ids.get(name)) is None:
+            wire = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.op.append(ASSIGN)
+            self.a.append(0)
+            self.b.append(0)
+            self.flags.append(0)
+        return wire
+
+    def operand(self: Netlist, value: str | int) -> tuple[int, bool]:
+        """Return an operand as ``(wire ID or literal, is_literal)``."""
+        if isinstance(value, int):
+            return value & MASK, True
+        return self.wire_id(value), False
+
+    def add_gate(
+        self: Netlist,
+        target: str,
+        op: str | None,
+        val1: str | int | None,
+        val2: str | int,
+    ) -> None:
+        """Add (or replace) the gate driving ``target``."""
+        if op not in OPCODES:
+            raise ValueError(f"Unknown operation: {op}")
+        if (val1 is None) != (op in (None, "NOT")):
+            raise ValueError(f"Wrong number of operands for {op or 'assignment'}")
+        wire = self.wire_id(target)
+        flags = DEFINED
+        if val1 is not None:
+            self.a[wire], literal = self.operand(val1)
+            flags |= A_IMMEDIATE if literal else 0
+        self.b[wire], literal = self.operand(val2)
+        flags |= B_IMMEDIATE if literal else 0
+        self.op[wire] = OPCODES[op]
+        self.flags[wire] = flags
+
+    @classmethod
+    def from_state(cls: type[Netlist], eval_state: EvaluationState) -> Netlist:
+        """Build a netlist from a parsed ``EvaluationState``."""
+        netlist = cls.empty()
+        for target, expr in eval_state.state.items():
+            netlist.add_gate(target, expr.op, expr.val1, expr.val2)
+        return netlist
+
+    @classmethod
+    def from_text(cls: type[Netlist], data: str) -> Netlist:
+        """Parse a whole circuit in one pass, without building per-gate objects.
+
+        Wire names are interned to IDs as they are first seen, and each gate goes
+        straight into the parallel arrays.
+        """
+        netlist = cls.empty()
+        add_gate = netlist.add_gate
+        for match in GATE_PATTERN.finditer(data):
+            val1, op, val2, target, bad = match.groups("")
+            if bad:
+                raise ValueError(f"Bad gate: {bad}")
+            add_gate(
+                target,
+                op or None,
+                int(val1) if val1.isdigit() else val1 or None,
+                int(val2) if val2.isdigit() else val2,
+            )
+        return netlist
+
+    def columns(self: Netlist) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return NumPy views of ``op``, ``a``, ``b`` and ``flags``.
+
+        The views share memory with the netlist, so no gate data is copied. No
+        wires can be added while any view is alive.
+        """
+        return (
+            np.frombuffer(self.op, dtype=np.uint8),
+            np.frombuffer(self.a, dtype=np.uint32),
+            np.frombuffer(self.b, dtype=np.uint32),
+            np.frombuffer(self.flags, dtype=np.uint8),
+        )
+
+    def inputs(self: Netlist, wire: int) -> list[int]:
+        """Return the wires read by the gate driving ``wire``."""
+        flags = self.flags[wire]
+        wires = [] if flags & B_IMMEDIATE else [self.b[wire]]
+        if self.op[wire] > NOT and not flags & A_IMMEDIATE:
+            wires.append(self.a[wire])
+        return wires
+
+
+def find_cycle(netlist: Netlist, waiting: list[int]) -> list[int]:
+    """Return the wires of one cycle, in the direction signals flow.
+
+    ``waiting`` counts the unordered inputs of each wire after a topological
+    sort has stalled. Every wire still waiting reads another such wire, so
+    following those inputs back from any of them must eventually repeat a wire.
+    """
+    wire = next(w for w, count in enumerate(waiting) if count)
+    seen: dict[int, int] = {}
+    path: list[int] = []
+    while wire not in seen:
+        seen[wire] = len(path)
+        path.append(wire)
+        wire = next(k for k in netlist.inputs(wire) if waiting[k])
+    return path[seen[wire] :][::-1]
+
+
+@dataclass
+class Program:
+    """A netlist together with an order in which its gates can be evaluated.
+
+    The wires reading wire ``w`` are ``targets[offsets[w] : offsets[w + 1]]``.
+    """
+
+    netlist: Netlist
+    order: array
+    offsets: array
+    targets: array
+
+    @classmethod
+    def compile(cls: type[Program], netlist: Netlist) -> Program:
+        """Sort the wires topologically (without recursion).
+
+        Raises ``ValueError`` if a wire is used but never driven, or if the
+        circuit contains a cycle.
+        """
+        num_wires = len(netlist.names)
+        undefined = [
+            name
+            for name, flags in zip(netlist.names, netlist.flags)
+            if not flags & DEFINED
+        ]
+        if undefined:
+            raise ValueError(f"Wires used but never driven: {', '.join(undefined)}")
+        sources = [netlist.inputs(wire) for wire in range(num_wires)]
+        waiting = [len(k) for k in sources]
+        offsets = array("I", [0]) * (num_wires + 1)
+        for wires in sources:
+            for source in wires:
+                offsets[source + 1] += 1
+        for wire in range(num_wires):
+            offsets[wire + 1] += offsets[wire]
+        targets = array("I", [0]) * offsets[num_wires]
+        fill = offsets[:-1]
+        for wire, wires in enumerate(sources):
+            for source in wires:
+                targets[fill[source]] = wire
+                fill[source] += 1
+        ready = deque(wire for wire in range(num_wires) if waiting[wire] == 0)
+        order = array("I")
+        while ready:
+            wire = ready.popleft()
+            order.append(wire)
+            for dependent in targets[offsets[wire] : offsets[wire + 1]]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != num_wires:
+            cycle = [netlist.names[w] for w in find_cycle(netlist, waiting)]
+            if len(cycle) > MAX_REPORTED_CYCLE:
+                shown = cycle[: MAX_REPORTED_CYCLE - 1]
+                path = " -> ".join(shown) + f" -> ... ({len(cycle)} wires)"
+            else:
+                path = " -> ".join(cycle)
+            raise ValueError(f"Circuit has a cycle: {path} -> {cycle[0]}")
+        return cls(netlist, order, offsets, targets)
+
+    def gate_value(self: Program, regs: array, wire: int) -> int:
+        """Evaluate the gate driving one wire from the current register values."""
+        net = self.netlist
+        f = net.flags[wire]
+        y = net.b[wire] if f & B_IMMEDIATE else regs[net.b[wire]]
+        code = net.op[wire]
+        if code == ASSIGN:
+            return y
+        elif code == NOT:
+            return ~y & MASK
+        x = net.a[wire] if f & A_IMMEDIATE else regs[net.a[wire]]
+        if code == AND:
+            return x & y
+        elif code == OR:
+            return x | y
+        elif code == LSHIFT:
+            return (x << y) & MASK
+        return x >> y
+
+    def run(self: Program, overrides: dict[str, int] | None = None) -> array:
+        """Evaluate every wire, returning a ``uint16`` register file by wire ID.
+
+        Wires in ``overrides`` take the given values instead of their gates'.
+        """
+        net = self.netlist
+        forced = {net.ids[k]: v & MASK for k, v in (overrides or {}).items()}
+        op, a, b, flags = net.op, net.a, net.b, net.flags
+        regs = array("H", bytes(2 * len(net.names)))
+        for wire in self.order:
+            if wire in forced:
+                regs[wire] = forced[wire]
+                continue
+            f = flags[wire]
+            y = b[wire] if f & B_IMMEDIATE else regs[b[wire]]
+            code = op[wire]
+            if code == ASSIGN:
+                regs[wire] = y
+            elif code == NOT:
+                regs[wire] = ~y & MASK
+            else:
+                x = a[wire] if f & A_IMMEDIATE else regs[a[wire]]
+                if code == AND:
+                    regs[wire] = x & y
+                elif code == OR:
+                    regs[wire] = x | y
+                elif code == LSHIFT:
+                    regs[wire] = (x << y) & MASK
+                else:
+                    regs[wire] = x >> y
+        return regs
+
+    def values(
+        self: Program, overrides: dict[str, int] | None = None
+    ) -> dict[str, int]:
+        """Evaluate every wire, returning the values by wire name."""
+        return dict(zip(self.netlist.names, self.run(overrides)))
+
+    def run_batch(
+        self: Program, inputs: Mapping[str, npt.ArrayLike], outputs: Iterable[str]
+    ) -> dict[str, np.ndarray]:
+        """Evaluate the circuit for a whole batch of input assignments at once.
+
+        Each wire in ``inputs`` is overridden by an array of values, and all of
+        the arrays are broadcast together. Every gate then runs once on NumPy
+        ``uint16`` vectors; wires that do not depend on the inputs stay scalars.
+        Only the gates feeding ``outputs`` are evaluated, and a wire's vector is
+        dropped after its last reader has run, so memory follows the widest cut
+        through the circuit rather than its size.
+        """
+        net = self.netlist
+        forced = {
+            net.ids[k]: (np.asarray(v) & MASK).astype(np.uint16)
+            for k, v in inputs.items()
+        }
+        shape = np.broadcast_shapes(*(v.shape for v in forced.values()))
+        wanted = [net.ids[name] for name in outputs]
+        needed = bytearray(len(self.order))
+        stack = list(wanted)
+        while stack:
+            if not needed[wire := stack.pop()]:
+                needed[wire] = 1
+                if wire not in forced:
+                    stack.extend(net.inputs(wire))
+        schedule = [wire for wire in self.order if needed[wire]]
+        last_use = {wire: idx for idx, wire in enumerate(schedule)}
+        for idx, wire in enumerate(schedule):
+            if wire not in forced:
+                for source in net.inputs(wire):
+                    last_use[source] = idx
+        release: list[list[int]] = [[] for _ in schedule]
+        for wire in set(last_use) - set(wanted):
+            release[last_use[wire]].append(wire)
+        op, a, b, flags = net.op, net.a, net.b, net.flags
+        regs: list[Any] = [None] * len(self.order)
+        for idx, wire in enumerate(schedule):
+            if wire in forced:
+                regs[wire] = forced[wire]
+            else:
+                f = flags[wire]
+                y = np.uint16(b[wire]) if f & B_IMMEDIATE else regs[b[wire]]
+                code = op[wire]
+                if code == ASSIGN:
+                    regs[wire] = y
+                elif code == NOT:
+                    regs[wire] = ~y
+                else:
+                    x = np.uint16(a[wire]) if f & A_IMMEDIATE else regs[a[wire]]
+                    if code == AND:
+                        regs[wire] = x & y
+                    elif code == OR:
+                        regs[wire] = x | y
+                    elif code == LSHIFT:
+                        regs[wire] = x << y
+                    else:
+                        regs[wire] = x >> y
+            for done in release[idx]:
+                regs[done] = None
+        return {
+            net.names[wire]: np.array(np.broadcast_to(regs[wire], shape))
+            for wire in wanted
+        }
+
+
+@dataclass(frozen=True)
+class CompiledCircuit:
+    """A circuit specialised into a Python function of its input wires.
+
+    ``function`` takes the values of ``inputs`` positionally and returns the
+    values of ``outputs`` as a tuple. ``source`` is the generated code.
+    """
+
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+    source: str
+    function: Callable[..., tuple[int, ...]]
+
+    @classmethod
+    def build(
+        cls: type[CompiledCircuit],
+        program: Program,
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = ("a",),
+    ) -> CompiledCircuit:
+        """Generate the function for a compiled program.
+
+        Only the gates feeding ``outputs`` are kept. Gates whose operands are
+        known constants are folded, as are identities such as ``x AND 65535``,
+        so the generated code only does arithmetic that depends on ``inputs``.
+        """
+        net = program.netlist
+        inputs, outputs = tuple(inputs), tuple(outputs)
+        params = {net.ids[name]: f"w{net.ids[name]}" for name in inputs}
+        needed = bytearray(len(program.order))
+        stack = [net.ids[name] for name in outputs]
+        while stack:
+            if not needed[wire := stack.pop()]:
+                needed[wire] = 1
+                if wire not in params:
+                    stack.extend(net.inputs(wire))
+        known: dict[int, int | str] = dict(params)
+        lines = [f"def evaluate({', '.join(params.values())}):"]
+        for wire in program.order:
+            if not needed[wire] or wire in params:
+                continue
+            f = net.flags[wire]
+            y = net.b[wire] if f & B_IMMEDIATE else known[net.b[wire]]
+            x: int | str = 0
+            if net.op[wire] > NOT:
+                x = net.a[wire] if f & A_IMMEDIATE else known[net.a[wire]]
+            value = _fold(net.op[wire], x, y)
+            if isinstance(value, str) and not value.isidentifier():
+                lines.append(f"    w{wire} = {value}")
+                value = f"w{wire}"
+            known[wire] = value
+        returned = "".join(f"{known[net.ids[name]]}, " for name in outputs)
+        lines.append(f"    return ({returned})")
+        source = "\n".join(lines) + "\n"
+        namespace: dict[str, Any] = {}
+        exec(compile(source, "<circuit>", "exec"), namespace)
+        return cls(inputs, outputs, source, namespace["evaluate"])
+
+    def evaluate(self: CompiledCircuit, **values: int) -> dict[str, int]:
+        """Return the output wires given the input wires by name."""
+        args = [values[name] & MASK for name in self.inputs]
+        return dict(zip(self.outputs, self.function(*args)))
+
+
+def _fold(code: int, x: int | str, y: int | str) -> int | str:
+    """Return a gate's value, or a Python expression for it if not constant."""
+    if code == ASSIGN:
+        return y
+    elif code == NOT:
+        return ~y & MASK if isinstance(y, int) else f"{y} ^ {MASK}"
+    if isinstance(x, int) and isinstance(y, int):
+        if code == AND:
+            return x & y
+        elif code == OR:
+            return x | y
+        elif code == LSHIFT:
+            return (x << y) & MASK
+        return x >> y
+    if code in (AND, OR):
+        const, var = (x, y) if isinstance(x, int) else (y, x)
+        if const == (0 if code == AND else MASK):
+            return const
+        elif const == (MASK if code == AND else 0):
+            return var
+        return f"{x} {'&' if code == AND else '|'} {y}"
+    elif isinstance(y, int) and y == 0:
+        return x
+    elif isinstance(y, int) and y >= 16:
+        return 0
+    elif x == 0:
+        return 0
+    elif code == LSHIFT:
+        return f"({x} << {y}) & {MASK}"
+    return f"{x} >> {y}"
+
+
+class IncrementalCircuit:
+    """Keep the value of every wire up to date while wires are overridden.
+
+    Changing an override only re-evaluates the wires downstream of it, in
+    topological order, and stops following any path whose value is unchanged.
+    """
+
+    def __init__(self: IncrementalCircuit, program: Program) -> None:
+        """Evaluate the circuit without any overrides."""
+        self.program = program
+        self.position = array("I", [0]) * len(program.order)
+        for idx, wire in enumerate(program.order):
+            self.position[wire] = idx
+        self.overrides: dict[int, int] = {}
+        self.regs = program.run()
+
+    def value(self: IncrementalCircuit, name: str) -> int:
+        """Return the current value of a wire."""
+        return self.regs[self.program.netlist.ids[name]]
+
+    def override(self: IncrementalCircuit, name: str, value: int) -> None:
+        """Force a wire to a value and update its downstream cone."""
+        wire = self.program.netlist.ids[name]
+        self.overrides[wire] = value & MASK
+        self._update(wire)
+
+    def clear_override(self: IncrementalCircuit, name: str) -> None:
+        """Let a wire take its gate's value again."""
+        wire = self.program.netlist.ids[name]
+        if self.overrides.pop(wire, None) is not None:
+            self._update(wire)
+
+    def clear_overrides(self: IncrementalCircuit) -> None:
+        """Remove every override."""
+        for name in [self.program.netlist.names[w] for w in self.overrides]:
+            self.clear_override(name)
+
+    def _update(self: IncrementalCircuit, wire: int) -> None:
+        program, regs, overrides = self.program, self.regs, self.overrides
+        offsets, targets, position = program.offsets, program.targets, self.position
+        heap = [(position[wire], wire)]
+        queued = {wire}
+        while heap:
+            _, wire = heappop(heap)
+            if wire in overrides:
+                new_value = overrides[wire]
+            else:
+                new_value = program.gate_value(regs, wire)
+            if new_value == regs[wire]:
+                continue
+            regs[wire] = new_value
+            for dependent in targets[offsets[wire] : offsets[wire + 1]]:
+                if dependent not in queued:
+                    queued.add(dependent)
+                    heappush(heap, (position[dependent], dependent))
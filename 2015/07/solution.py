@@ -2,18 +2,24 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Callable
-from copy import deepcopy
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
+from hashlib import sha256
 from sys import argv
 from typing import Final
 
+import numpy as np
+import numpy.typing as npt
+
 from _resources import main, make_reporter, print_help
+from circuit import CompiledCircuit, IncrementalCircuit, Netlist, Program
 
 EXPR_PARSER: Final[re.Pattern] = re.compile(
     r"((?P<val1>[a-z]+|\d+) )?((?P<op>[A-Z]+) )?(?P<val2>[a-z]+|\d+)"
 )
 
+_COMPILED: dict[tuple[str, tuple[str, ...], tuple[str, ...]], CompiledCircuit] = {}
+
 
 @dataclass
 class AssignmentExpression:
@@ -125,23 +131,54 @@ def parse_input(data: str) -> EvaluationState:
     return eval_state
 
 
-def part1(eval_state: EvaluationState) -> str:
-    """Solve part 1 of the puzzle and set up the change for Part 2."""
-    ev_copy = deepcopy(eval_state)  # Keep input intact for Part 2
-    soln = ev_copy.state["a"].simplify(ev_copy)
-    eval_state.state["b"] = AssignmentExpression(None, soln, None)
-    return str(soln)
+def load_circuit(data: str) -> IncrementalCircuit:
+    """Parse the input and evaluate the circuit, tracking each wire's dependents."""
+    return IncrementalCircuit(Program.compile(Netlist.from_text(data)))
+
+
+def evaluate_batch(
+    data: str, inputs: Mapping[str, npt.ArrayLike], outputs: Iterable[str] = ("a",)
+) -> dict[str, np.ndarray]:
+    """Evaluate the output wires for every assignment in a batch of inputs.
+
+    For example, ``evaluate_batch(data, {"b": np.arange(65536)})["a"]`` gives
+    the signal on ``a`` for each possible signal on ``b``.
+    """
+    return Program.compile(Netlist.from_text(data)).run_batch(inputs, outputs)
+
+
+def compile_circuit(
+    data: str, inputs: Iterable[str] = (), outputs: Iterable[str] = ("a",)
+) -> CompiledCircuit:
+    """Return a specialised function for the circuit, compiling it only once.
+
+    Results are cached by the SHA-256 digest of the input text, so evaluating a
+    circuit again skips both parsing and compilation.
+    """
+    key = (sha256(data.encode()).hexdigest(), tuple(inputs), tuple(outputs))
+    if (compiled := _COMPILED.get(key)) is None:
+        program = Program.compile(Netlist.from_text(data))
+        compiled = _COMPILED[key] = CompiledCircuit.build(program, key[1], key[2])
+    return compiled
+
+
+def part1(circuit: IncrementalCircuit) -> str:
+    """Solve part 1 of the puzzle."""
+    circuit.clear_overrides()
+    return str(circuit.value("a"))
 
 
-def part2(eval_state: EvaluationState) -> str:
-    """Solve part 2 of the puzzle."""
-    return str(eval_state.state["a"].simplify(eval_state))
+def part2(circuit: IncrementalCircuit) -> str:
+    """Solve part 2 of the puzzle by overriding ``b`` with the Part 1 answer."""
+    circuit.clear_overrides()
+    circuit.override("b", circuit.value("a"))
+    return str(circuit.value("a"))
 
 
-RESULT_FCNS: Final[dict[str, Callable[[EvaluationState], str]]] = {
+RESULT_FCNS: Final[dict[str, Callable[[IncrementalCircuit], str]]] = {
     "Part 1": part1,
     "Part 2": part2,
 }
 
 if __name__ == "__main__":
-    main(argv, print_help, make_reporter(parse_input, RESULT_FCNS))
+    main(argv, print_help, make_reporter(load_circuit, RESULT_FCNS))
@@ -1,8 +1,11 @@
 """Solution to Day 8 of 2015 Advent of Code."""
 
+from collections.abc import Callable
 from sys import argv
+from typing import Final
 
-from _resources import main, make_reporter, print_help
+from _resources import Console, print_help, report_results, watch_main
+from escapes import file_overheads
 
 
 def extra_chars(text: str, literal: bool = True) -> int:
@@ -41,15 +44,21 @@ def _extra_chars_mem(text: str) -> int:
     return 2 + sum(text.count(k) for k in ["\\", '"'])
 
 
+LINE_FCNS: Final[dict[str, Callable[[str], int]]] = {
+    "Part 1": extra_chars,
+    "Part 2": (lambda x: extra_chars(x, False)),
+}
+
+FILE_RESULTS: Final[dict[str, Callable[[tuple[int, int]], str]]] = {
+    "Part 1": (lambda x: str(x[0])),
+    "Part 2": (lambda x: str(x[1])),
+}
+
 if __name__ == "__main__":
-    main(
-        argv,
-        print_help,
-        make_reporter(
-            lambda x: x.splitlines(),
-            {
-                "Part 1": (lambda x: str(sum(extra_chars(k) for k in x))),
-                "Part 2": (lambda x: str(sum(extra_chars(k, False) for k in x))),
-            },
-        ),
-    )
+    if len(argv) > 2 and argv[1] == "--watch":
+        watch_main(argv, LINE_FCNS)
+    elif len(argv) > 1:
+        # The file is memory-mapped and counted in chunks by worker processes
+        report_results(argv[0], Console(), file_overheads, FILE_RESULTS, argv[1])
+    else:
+        print_help(Console(), argv[0])
@@ -0,0 +1,73 @@
+"""Exact Day 9 route costs by Held-Karp dynamic programming over subsets."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def distance_matrix(
+    locations: set[str], costs: dict[frozenset[str], int]
+) -> tuple[list[str], np.ndarray]:
+    """Index the locations and return them with their distance matrix.
+
+    Pairs of locations without a listed cost are ``inf`` apart.
+    """
+    names = sorted(locations)
+    index = {name: idx for idx, name in enumerate(names)}
+    dist = np.full((len(names), len(names)), np.inf)
+    np.fill_diagonal(dist, 0)
+    for pair, cost in costs.items():
+        start, end = tuple(pair)
+        dist[index[start], index[end]] = dist[index[end], index[start]] = cost
+    return names, dist
+
+
+def shortest_open_path(dist: np.ndarray) -> float:
+    """Return the cost of the cheapest path visiting every location once.
+
+    ``best[mask, j]`` is the cheapest path through the locations in ``mask``
+    that ends at ``j``. The masks are filled in order of their number of
+    locations, each layer with one NumPy operation per end point, so the work
+    is ``O(2^n n^2)`` and the table has ``2^n n`` entries. Returns ``inf`` if no
+    such path exists.
+    """
+    num = len(dist)
+    if num < 2:
+        return 0.0
+    sizes = np.zeros(1, dtype=np.int8)
+    for _ in range(num):
+        sizes = np.concatenate((sizes, sizes + 1))
+    masks = np.argsort(sizes, kind="stable")
+    layers = np.split(masks, np.cumsum(np.bincount(sizes))[:-1])
+    best = np.full((1 << num, num), np.inf)
+    best[1 << np.arange(num), np.arange(num)] = 0
+    for layer in layers[2:]:
+        for end in range(num):
+            with_end = layer[(layer >> end) & 1 == 1]
+            best[with_end, end] = (best[with_end ^ (1 << end)] + dist[:, end]).min(
+                axis=1
+            )
+    return float(best[-1].min())
+
+
+def longest_open_path(dist: np.ndarray) -> float:
+    """Return the cost of the most expensive path visiting every location once.
+
+    Returns ``-inf`` if no such path exists.
+    """
+    negated = np.where(np.isinf(dist), np.inf, -dist)
+    return -shortest_open_path(negated)
+
+
+def route_extremes(
+    locations: set[str], costs: dict[frozenset[str], int]
+) -> tuple[int, int]:
+    """Return the costs of the shortest and longest routes.
+
+    Raises ``ValueError`` if no route visits every location.
+    """
+    _, dist = distance_matrix(locations, costs)
+    shortest, longest = shortest_open_path(dist), longest_open_path(dist)
+    if np.isinf(shortest):
+        raise ValueError("No route visits every location")
+    return int(shortest), int(longest)
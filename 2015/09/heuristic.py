@@ -0,0 +1,189 @@
+"""Anytime heuristic Day 9 routes, for graphs too large to solve exactly."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import monotonic
+from typing import Final
+
+import numpy as np
+
+from held_karp import distance_matrix
+
+TIME_BUDGET: Final[float] = 5.0  # seconds
+EPSILON: Final[float] = 1e-9
+NEAREST_NEIGHBOUR_STARTS: Final[int] = 8
+MIN_KICK_LENGTH: Final[int] = 8  # Shortest route worth perturbing
+
+
+@dataclass
+class RouteResult:
+    """Represent the best route found, with a bound on the optimal cost."""
+
+    route: list[str]
+    cost: int
+    bound: int
+
+    @property
+    def gap(self: RouteResult) -> float:
+        """Return the distance from the bound, relative to the bound."""
+        return abs(self.cost - self.bound) / abs(self.bound) if self.bound else 0.0
+
+
+def spanning_tree_weight(dist: np.ndarray) -> float:
+    """Return the weight of a minimum spanning tree (Prim's algorithm).
+
+    Every route is a spanning tree, so no route is cheaper than this. Returns
+    ``inf`` if the graph is disconnected.
+    """
+    num = len(dist)
+    in_tree = np.zeros(num, dtype=bool)
+    link = dist[0].copy()
+    in_tree[0] = True
+    total = 0.0
+    for _ in range(num - 1):
+        nearest = int(np.argmin(np.where(in_tree, np.inf, link)))
+        total += link[nearest]
+        in_tree[nearest] = True
+        link = np.minimum(link, dist[nearest])
+    return total
+
+
+def search_matrix(dist: np.ndarray) -> np.ndarray:
+    """Return the matrix the local search runs on.
+
+    Missing edges get a cost larger than any route, and a dummy location at zero
+    distance from every other closes each open route into a tour, so that moves
+    touching either end of the route need no special cases.
+    """
+    finite = np.isfinite(dist)
+    penalty = len(dist) * (np.abs(dist[finite]).max(initial=0) + 1)
+    work = np.zeros((len(dist) + 1, len(dist) + 1))
+    work[:-1, :-1] = np.where(finite, dist, penalty)
+    return work
+
+
+def tour_cost(work: np.ndarray, tour: np.ndarray) -> float:
+    """Return the cost of a closed tour."""
+    return float(work[tour, np.roll(tour, -1)].sum())
+
+
+def nearest_neighbour(work: np.ndarray, start: int) -> np.ndarray:
+    """Build a tour by always moving to the closest unvisited location."""
+    num = len(work) - 1
+    visited = np.zeros(num, dtype=bool)
+    path = [start]
+    visited[start] = True
+    for _ in range(num - 1):
+        path.append(int(np.argmin(np.where(visited, np.inf, work[path[-1], :-1]))))
+        visited[path[-1]] = True
+    return np.array([num, *path])
+
+
+def two_opt(work: np.ndarray, tour: np.ndarray, deadline: float) -> bool:
+    """Reverse segments of the tour while that shortens it.
+
+    The best reversal starting at each position is found with one NumPy
+    operation. Returns True if the tour was changed.
+    """
+    changed = False
+    for i in range(1, len(tour) - 1):
+        if monotonic() > deadline:
+            break
+        ends, after = tour[i + 1 :], np.roll(tour, -1)[i + 1 :]
+        delta = (
+            work[tour[i - 1], ends]
+            + work[tour[i], after]
+            - work[tour[i - 1], tour[i]]
+            - work[ends, after]
+        )
+        if delta[best := int(np.argmin(delta))] < -EPSILON:
+            tour[i : i + best + 2] = tour[i : i + best + 2][::-1].copy()
+            changed = True
+    return changed
+
+
+def or_opt(work: np.ndarray, tour: np.ndarray, deadline: float) -> bool:
+    """Move segments of up to three locations while that shortens the tour.
+
+    Each segment may be reinserted, either way round, between any other pair of
+    neighbouring locations. Returns True if the tour was changed.
+    """
+    changed = False
+    for length in (1, 2, 3):
+        for i in range(1, len(tour) - length + 1):
+            if monotonic() > deadline:
+                return changed
+            first, last = tour[i], tour[i + length - 1]
+            before, after = tour[i - 1], tour[(i + length) % len(tour)]
+            removal = work[before, after] - work[before, first] - work[last, after]
+            starts, ends = tour, np.roll(tour, -1)
+            forward = work[starts, first] + work[last, ends]
+            backward = work[starts, last] + work[first, ends]
+            insertion = np.minimum(forward, backward) - work[starts, ends]
+            insertion[i - 1 : i + length] = np.inf  # Edges touching the segment
+            if removal + insertion[k := int(np.argmin(insertion))] < -EPSILON:
+                segment = tour[i : i + length]
+                if backward[k] < forward[k]:
+                    segment = segment[::-1]
+                rest = np.concatenate((tour[:i], tour[i + length :]))
+                pos = k + 1 if k < i else k + 1 - length
+                tour[:] = np.concatenate((rest[:pos], segment, rest[pos:]))
+                changed = True
+    return changed
+
+
+def double_bridge(tour: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Return a copy of the tour with its route cut in three places and reordered."""
+    path = tour[1:]
+    a, b, c = np.sort(rng.choice(np.arange(1, len(path)), 3, replace=False))
+    return np.concatenate((tour[:1], path[:a], path[b:c], path[a:b], path[c:]))
+
+
+def solve_route(
+    locations: set[str],
+    costs: dict[frozenset[str], int],
+    maximize: bool = False,
+    time_budget: float = TIME_BUDGET,
+    seed: int = 0,
+) -> RouteResult:
+    """Find a short (or long) route within a time budget.
+
+    Routes are built by nearest neighbour from a few random locations, then
+    from perturbations of the best route so far. Each is improved with 2-opt and
+    Or-opt until neither helps. The best route found is returned when the time
+    is up, or as soon as it meets the spanning tree bound. At least one route is
+    always built, however small the budget.
+
+    Raises ``ValueError`` if no route visiting every location was found.
+    """
+    deadline = monotonic() + time_budget
+    names, dist = distance_matrix(locations, costs)
+    sign = -1 if maximize else 1
+    objective = np.where(np.isfinite(dist), sign * dist, np.inf)
+    bound = spanning_tree_weight(objective)
+    work = search_matrix(objective)
+    rng = np.random.default_rng(seed)
+    starts = rng.permutation(len(names))[:NEAREST_NEIGHBOUR_STARTS]
+    best_tour, best_cost = None, np.inf
+    attempt = 0
+    while best_tour is None or monotonic() < deadline:
+        if attempt < len(starts):
+            tour = nearest_neighbour(work, int(starts[attempt]))
+        elif len(names) >= MIN_KICK_LENGTH and best_tour is not None:
+            tour = double_bridge(best_tour, rng)
+        else:
+            break
+        attempt += 1
+        while two_opt(work, tour, deadline) | or_opt(work, tour, deadline):
+            pass
+        if (cost := tour_cost(work, tour)) < best_cost - EPSILON:
+            best_tour, best_cost = tour, cost
+            if best_cost <= bound + EPSILON:
+                break
+    assert best_tour is not None
+    path = best_tour[1:]
+    route_cost = float(dist[path[:-1], path[1:]].sum())
+    if not np.isfinite(route_cost):
+        raise ValueError("No route found that visits every location")
+    return RouteResult([names[k] for k in path], round(route_cost), round(sign * bound))
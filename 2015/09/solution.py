@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from itertools import combinations, permutations
+from functools import partial
 from sys import argv
 
 from rich.console import Console
 
 from _resources import PuzzleSolution
+from held_karp import route_extremes
+from heuristic import TIME_BUDGET, solve_route
 
 
 def parse_line(text: str) -> tuple[frozenset[str], int]:
@@ -28,23 +30,10 @@ def parse_input(text: str) -> tuple[set[str], dict[frozenset[str], int]]:
     return locations, costs
 
 
-def route_cost(places: list[str], cost_data: dict[frozenset[str], int]) -> int:
-    """Return the cost of a route."""
-    return sum(cost_data[frozenset(pair)] for pair in zip(places[:-1], places[1:]))
-
-
-def all_route_costs(locations: set[str], costs: dict[frozenset[str], int]) -> list[int]:
-    """Part 1 of puzzle."""
-    return [
-        route_cost([endpoints[0]] + list(middle) + [endpoints[1]], costs)
-        for endpoints in combinations(locations, 2)
-        for middle in permutations(locations - set(endpoints))
-    ]
-
-
 def process_input(text: str) -> dict:
-    """Process the input and return a list of costs."""
-    return {"costs": all_route_costs(*parse_input(text))}
+    """Process the input and return the shortest and longest route costs."""
+    shortest, longest = route_extremes(*parse_input(text))
+    return {"shortest": shortest, "longest": longest}
 
 
 pz = PuzzleSolution.from_parser(process_input)
@@ -53,16 +42,48 @@ pz = PuzzleSolution.from_parser(process_input)
 @pz.register_result_function("Part 1")
 def part1(data: dict) -> str:
     """Return the minimum route cost."""
-    return str(min(data["costs"]))
+    return str(data["shortest"])
 
 
 @pz.register_result_function("Part 2")
 def part2(data: dict) -> str:
     """Return the maximum route cost."""
-    return str(max(data["costs"]))
+    return str(data["longest"])
+
+
+def process_heuristic(text: str, time_budget: float = TIME_BUDGET) -> dict:
+    """Process the input with the heuristic solver, splitting the time budget."""
+    locations, costs = parse_input(text)
+    return {
+        "shortest": solve_route(locations, costs, False, time_budget / 2),
+        "longest": solve_route(locations, costs, True, time_budget / 2),
+    }
+
+
+pz_heuristic = PuzzleSolution.from_parser(process_heuristic)
+
+
+@pz_heuristic.register_result_function("Part 1")
+def part1_heuristic(data: dict) -> str:
+    """Return the shortest route cost found and its gap to the lower bound."""
+    return f"{data['shortest'].cost} (within {data['shortest'].gap:.1%} of bound)"
+
+
+@pz_heuristic.register_result_function("Part 2")
+def part2_heuristic(data: dict) -> str:
+    """Return the longest route cost found and its gap to the upper bound."""
+    return f"{data['longest'].cost} (within {data['longest'].gap:.1%} of bound)"
 
 
 if __name__ == "__main__":
+    # ``--heuristic SECONDS`` finds approximate routes within a time budget, for
+    # inputs with too many locations to solve exactly.
+    if len(argv) > 2 and argv[1] == "--heuristic":
+        pz_heuristic.input_parser = partial(
+            process_heuristic, time_budget=float(argv[2])
+        )
+        pz = pz_heuristic
+
     pz.add_input("example_input.txt", "Example input")
     pz.add_input("input.txt", "Puzzle input")
 